@@ -1,54 +1,56 @@
-import sqlite3
+import asyncio
 from datetime import datetime, timedelta
 from fastapi import APIRouter
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.database.detection_writer import detection_writer
 
 
 router = APIRouter()
 
 
-@router.delete("/cleanup_old_devices")
-async def cleanup_old_devices():
-    """Удаление устройств, которые не были в сети более 1 часа"""
-    conn = sqlite3.connect(state.db_path)
-    cursor = conn.cursor()
-
-    # Удаляем устройства, которые не были в сети более 1 часа
-    cutoff_time = (datetime.now() - timedelta(hours=1)).isoformat()
-
-    cursor.execute(
-        "DELETE FROM devices WHERE last_seen < ? AND status != 'online'", (cutoff_time,)
-    )
-
-    deleted_count = cursor.rowcount
-
-    # Также удаляем orphaned detections (без устройств)
-    cursor.execute(
-        """
-        DELETE FROM sound_detections 
-        WHERE device_id NOT IN (SELECT id FROM devices)
-        """
-    )
-
-    orphaned_detections = cursor.rowcount
-
-    # Удаляем дубликаты устройств (с одинаковым MAC адресом)
-    cursor.execute(
-        """
-        DELETE FROM devices 
-        WHERE id NOT IN (
-            SELECT MIN(id) 
-            FROM devices 
-            GROUP BY mac_address
+def _cleanup_old_devices():
+    conn = get_connection(state.db_path)
+    try:
+        cursor = conn.cursor()
+
+        # Удаляем устройства, которые не были в сети более 1 часа
+        cutoff_time = (datetime.now() - timedelta(hours=1)).isoformat()
+
+        cursor.execute(
+            "DELETE FROM devices WHERE last_seen < ? AND status != 'online'", (cutoff_time,)
+        )
+
+        deleted_count = cursor.rowcount
+
+        # Также удаляем orphaned detections (без устройств)
+        cursor.execute(
+            """
+            DELETE FROM sound_detections 
+            WHERE device_id NOT IN (SELECT id FROM devices)
+            """
+        )
+
+        orphaned_detections = cursor.rowcount
+
+        # Удаляем дубликаты устройств (с одинаковым MAC адресом)
+        cursor.execute(
+            """
+            DELETE FROM devices 
+            WHERE id NOT IN (
+                SELECT MIN(id) 
+                FROM devices 
+                GROUP BY mac_address
+            )
+            """
         )
-        """
-    )
 
-    duplicates_deleted = cursor.rowcount
+        duplicates_deleted = cursor.rowcount
 
-    conn.commit()
-    conn.close()
+        conn.commit()
+    finally:
+        release_connection(conn)
 
     return {
         "deleted_devices": deleted_count + duplicates_deleted,
@@ -57,15 +59,24 @@ async def cleanup_old_devices():
     }
 
 
-@router.get("/device_count")
-async def get_device_count():
-    """Получение количества устройств"""
-    conn = sqlite3.connect(state.db_path)
-    cursor = conn.cursor()
+@router.delete("/cleanup_old_devices")
+async def cleanup_old_devices():
+    """Удаление устройств, которые не были в сети более 1 часа"""
+    # Очередь детекций пишется до удаления сирот, чтобы не оставить новых
+    await detection_writer.flush()
+    return await asyncio.to_thread(_cleanup_old_devices)
+
 
-    cursor.execute("SELECT COUNT(*) FROM devices")
-    device_count = cursor.fetchone()[0]
+def _count_devices() -> int:
+    conn = get_connection(state.db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+    finally:
+        release_connection(conn)
 
-    conn.close()
 
+@router.get("/device_count")
+async def get_device_count():
+    """Получение количества устройств"""
+    device_count = await asyncio.to_thread(_count_devices)
     return {"device_count": device_count}
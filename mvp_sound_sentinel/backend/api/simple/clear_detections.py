@@ -1,15 +1,17 @@
-import sqlite3
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.database.detection_writer import detection_writer
 
 router = APIRouter()
 
-@router.delete("/devices/{device_id}/detections")
-async def clear_device_detections(device_id: str):
-    """Удаление всех детекций для указанного устройства"""
+
+def _delete_detections(device_id: str) -> int:
+    conn = get_connection(state.db_path)
     try:
-        conn = sqlite3.connect(state.db_path)
         cursor = conn.cursor()
         
         # Сначала проверяем существует ли устройство
@@ -22,14 +24,25 @@ async def clear_device_detections(device_id: str):
         
         deleted_count = cursor.rowcount
         conn.commit()
-        conn.close()
-        
-        print(f"🗑️ Deleted {deleted_count} detections for device {device_id}")
-        
-        return {"status": "cleared", "deleted_count": deleted_count}
-        
+        return deleted_count
+    finally:
+        release_connection(conn)
+
+
+@router.delete("/devices/{device_id}/detections")
+async def clear_device_detections(device_id: str):
+    """Удаление всех детекций для указанного устройства"""
+    # Сначала дописываем очередь DetectionWriter, иначе её пачка вернёт
+    # только что удалённые детекции
+    await detection_writer.flush()
+    try:
+        deleted_count = await asyncio.to_thread(_delete_detections, device_id)
     except HTTPException:
         raise
     except Exception as e:
         print(f"❌ Error clearing detections: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    print(f"🗑️ Deleted {deleted_count} detections for device {device_id}")
+
+    return {"status": "cleared", "deleted_count": deleted_count}
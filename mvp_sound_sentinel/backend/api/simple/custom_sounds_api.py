@@ -1,56 +1,139 @@
-import sqlite3
-import json
+import asyncio
 import uuid
 import os
 from datetime import datetime
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, PrivateAttr, model_validator
+from typing import Any, Dict, List, Literal, Optional
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.utils.audio import decode_pcm_base64
+from backend.utils.embeddings import (
+    embedding_from_db,
+    embedding_to_blob,
+    embeddings_from_db,
+    embeddings_to_blob,
+)
+from backend.utils.custom_matching import invalidate_custom_centroids
+from backend.utils.inference_pool import run_inference
+from backend.utils.notifications import invalidate_notification_settings
 from backend.utils.yamnet_cached import extract_embeddings as extract_yamnet_embeddings
 
 
 router = APIRouter()
 
+# Ответ GET /custom_sounds держим в памяти; train/delete его сбрасывают.
+_custom_sounds_cache: Optional[List[Dict[str, Any]]] = None
+_custom_sounds_lock = asyncio.Lock()
+
+
+async def invalidate_custom_sounds_cache() -> None:
+    global _custom_sounds_cache
+    async with _custom_sounds_lock:
+        _custom_sounds_cache = None
+
 
 class TrainSoundRequest(BaseModel):
     name: str
     sound_type: str
     device_id: str
-    audio_recordings: list[list[float]]
+    audio_recordings: list[list[float]] = []
+    # Compact alternative to `audio_recordings`: base64 little-endian PCM,
+    # decoded with np.frombuffer instead of validating every float.
+    audio_recordings_b64: List[str] = []
+    audio_dtype: Literal["int16", "float32"] = "float32"
     sample_rate: Optional[int] = 16000
     threshold: Optional[float] = None
+    # float32 samples decoded from `audio_recordings_b64` by the validator
+    _decoded_recordings: List[Any] = PrivateAttr(default_factory=list)
+
+    @model_validator(mode="after")
+    def _one_audio_source(self) -> "TrainSoundRequest":
+        if bool(self.audio_recordings) == bool(self.audio_recordings_b64):
+            raise ValueError(
+                "exactly one of audio_recordings or audio_recordings_b64 is required"
+            )
+        # Bad base64 or a byte length that isn't a whole number of samples
+        # is a client error (422), not a training failure
+        try:
+            self._decoded_recordings = [
+                decode_pcm_base64(recording, self.audio_dtype)
+                for recording in self.audio_recordings_b64
+            ]
+        except ValueError as e:
+            raise ValueError(f"invalid audio_recordings_b64: {e}") from e
+        return self
+
+    @property
+    def recordings(self) -> List[Any]:
+        return self._decoded_recordings or self.audio_recordings
 
 
 def _resample_audio_linear(
     audio: List[float], original_rate: int, target_rate: int
-) -> List[float]:
+) -> "np.ndarray":
     """Lightweight resample without librosa/scipy."""
-    if original_rate == target_rate:
-        return audio
-
     import numpy as np
 
     x = np.asarray(audio, dtype=np.float32)
-    if x.size == 0:
-        return []
+    if original_rate == target_rate or x.size == 0:
+        return x
 
     ratio = float(target_rate) / float(original_rate)
     new_len = max(1, int(round(x.size * ratio)))
     xp = np.arange(x.size, dtype=np.float32)
     fp = x
     x_new = np.linspace(0, x.size - 1, new_len, dtype=np.float32)
-    y_new = np.interp(x_new, xp, fp).astype(np.float32)
-    return y_new.tolist()
+    return np.interp(x_new, xp, fp).astype(np.float32)
+
+
+def _save_trained_sound(
+    request: TrainSoundRequest,
+    sound_id: str,
+    all_embeddings: List[List[float]],
+    centroid: List[float],
+    threshold: float,
+) -> None:
+    conn = get_connection(state.db_path)
+    try:
+        cursor = conn.cursor()
+
+        # Не плодим дубли одинакового имени/типа для одного устройства.
+        cursor.execute(
+            """
+            DELETE FROM custom_sounds
+            WHERE device_id = ? AND LOWER(name) = LOWER(?) AND LOWER(sound_type) = LOWER(?)
+            """,
+            (request.device_id, request.name, request.sound_type),
+        )
+
+        cursor.execute(
+            """
+            INSERT INTO custom_sounds 
+            (id, name, sound_type, embeddings, centroid, threshold, device_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                sound_id,
+                request.name,
+                request.sound_type,
+                embeddings_to_blob(all_embeddings),
+                embedding_to_blob(centroid),
+                threshold,
+                request.device_id,
+                datetime.now().isoformat(),
+            ),
+        )
+
+        conn.commit()
+    finally:
+        release_connection(conn)
 
 
 @router.post("/custom_sounds/train")
 async def train_custom_sound(request: TrainSoundRequest):
     """Тренировка и добавление нового кастомного звука из аудио записей"""
-    conn = sqlite3.connect(state.db_path)
-    cursor = conn.cursor()
-
     try:
         print(f"🎵 Обучение звука: {request.name}")
 
@@ -68,14 +151,12 @@ async def train_custom_sound(request: TrainSoundRequest):
         )
 
         all_embeddings = []
-        for recording in request.audio_recordings:
+        for recording in request.recordings:
             try:
-                audio_16k = (
-                    _resample_audio_linear(recording, sample_rate, 16000)
-                    if sample_rate != 16000
-                    else recording
+                audio_16k = _resample_audio_linear(recording, sample_rate, 16000)
+                embedding = await run_inference(
+                    extract_yamnet_embeddings, audio_16k, state.model
                 )
-                embedding = extract_yamnet_embeddings(audio_16k, state.model)
                 if embedding:
                     all_embeddings.append(embedding)
             except Exception as e:
@@ -87,38 +168,26 @@ async def train_custom_sound(request: TrainSoundRequest):
                 status_code=400, detail="Failed to extract embeddings from audio"
             )
 
-        centroid = np.mean(all_embeddings, axis=0).tolist()
+        # Centroid хранится L2-нормированным (‖c‖ = 1): косинус с ним — это
+        # просто скалярное произведение с нормированным запросом
+        centroid = np.mean(np.asarray(all_embeddings, dtype=np.float32), axis=0)
+        centroid_norm = float(np.linalg.norm(centroid))
+        if centroid_norm > 0:
+            centroid /= centroid_norm
+        centroid = centroid.tolist()
 
         sound_id = str(uuid.uuid4())
-
-        # Не плодим дубли одинакового имени/типа для одного устройства.
-        cursor.execute(
-            """
-            DELETE FROM custom_sounds
-            WHERE device_id = ? AND LOWER(name) = LOWER(?) AND LOWER(sound_type) = LOWER(?)
-            """,
-            (request.device_id, request.name, request.sound_type),
-        )
-
-        cursor.execute(
-            """
-            INSERT INTO custom_sounds 
-            (id, name, sound_type, embeddings, centroid, threshold, device_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                sound_id,
-                request.name,
-                request.sound_type,
-                json.dumps(all_embeddings),
-                json.dumps(centroid),
-                resolved_threshold,
-                request.device_id,
-                datetime.now().isoformat(),
-            ),
+        await asyncio.to_thread(
+            _save_trained_sound,
+            request,
+            sound_id,
+            all_embeddings,
+            centroid,
+            resolved_threshold,
         )
-
-        conn.commit()
+        invalidate_notification_settings(request.device_id)
+        invalidate_custom_centroids(request.device_id)
+        await invalidate_custom_sounds_cache()
         print(f"✅ Звук обучен и добавлен: {request.name}")
 
         return {
@@ -132,26 +201,30 @@ async def train_custom_sound(request: TrainSoundRequest):
     except HTTPException:
         raise
     except Exception as e:
-        conn.rollback()
         print(f"❌ Ошибка обучения звука: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _delete_custom_sound(sound_id: str) -> int:
+    conn = get_connection(state.db_path)
+    try:
+        cursor = conn.execute("DELETE FROM custom_sounds WHERE id = ?", (sound_id,))
+        conn.commit()
+        return cursor.rowcount
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 @router.delete("/custom_sounds/{sound_id}")
 async def delete_custom_sound(sound_id: str):
     """Удаление кастомного звука"""
-    conn = sqlite3.connect(state.db_path)
-    cursor = conn.cursor()
-
     try:
-        cursor.execute("DELETE FROM custom_sounds WHERE id = ?", (sound_id,))
-
-        if cursor.rowcount == 0:
+        if await asyncio.to_thread(_delete_custom_sound, sound_id) == 0:
             raise HTTPException(status_code=404, detail="Sound not found")
 
-        conn.commit()
+        invalidate_notification_settings()
+        invalidate_custom_centroids()
+        await invalidate_custom_sounds_cache()
         print(f"🗑️ Удален кастомный звук: {sound_id}")
 
         return {"message": "Sound deleted successfully"}
@@ -159,17 +232,12 @@ async def delete_custom_sound(sound_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        conn.rollback()
         print(f"❌ Ошибка удаления звука: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
 
 
-@router.get("/custom_sounds")
-async def get_custom_sounds():
-    """Получение всех кастомных звуков"""
-    conn = sqlite3.connect(state.db_path)
+def _fetch_custom_sounds():
+    conn = get_connection(state.db_path)
     cursor = conn.cursor()
 
     try:
@@ -197,8 +265,8 @@ async def get_custom_sounds():
                     "id": row[0],
                     "name": row[1],
                     "sound_type": row[2],
-                    "embeddings": json.loads(row[3]) if row[3] else [],
-                    "centroid": json.loads(row[4]) if row[4] else [],
+                    "embeddings": embeddings_from_db(row[3]),
+                    "centroid": embedding_from_db(row[4]),
                     "threshold": row[5],
                     "device_id": row[6],
                     "created_at": row[7],
@@ -206,9 +274,27 @@ async def get_custom_sounds():
             )
 
         return sounds
+    finally:
+        release_connection(conn)
 
+
+@router.get("/custom_sounds")
+async def get_custom_sounds(device_id: Optional[str] = None):
+    """Получение всех кастомных звуков (опционально для одного устройства)"""
+    global _custom_sounds_cache
+    try:
+        sounds = _custom_sounds_cache
+        if sounds is None:
+            async with _custom_sounds_lock:
+                if _custom_sounds_cache is None:
+                    _custom_sounds_cache = await asyncio.to_thread(
+                        _fetch_custom_sounds
+                    )
+                sounds = _custom_sounds_cache
     except Exception as e:
         print(f"❌ Ошибка получения звуков: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
+
+    if device_id is None:
+        return sounds
+    return [s for s in sounds if s["device_id"] == device_id]
@@ -1,48 +1,76 @@
-import sqlite3
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
 from backend.api.simple import state
+from backend.api.simple.custom_sounds_api import invalidate_custom_sounds_cache
+from backend.database.connection import get_connection, release_connection
+from backend.database.detection_writer import detection_writer
+from backend.utils.custom_matching import invalidate_custom_centroids
+from backend.utils.notifications import invalidate_notification_settings
 
 
 router = APIRouter()
 
+# Всё, что привязано к устройству; удаляется вместе с ним
+_DEVICE_CHILD_TABLES = (
+    "sound_detections",
+    "custom_sounds",
+    "notification_sounds",
+    "excluded_sounds",
+)
 
-@router.delete("/devices/{device_id}")
-async def delete_device(device_id: str):
-    """Удаление устройства и всех его детекций"""
-    conn = sqlite3.connect(state.db_path)
+
+def _delete_device(device_id: str) -> dict:
+    """Удаляет устройство с дочерними строками; возвращает счётчики по таблицам"""
+    conn = get_connection(state.db_path)
     cursor = conn.cursor()
     
     try:
-        # Сначала удаляем все детекции устройства
-        cursor.execute(
-            "DELETE FROM sound_detections WHERE device_id = ?",
-            (device_id,)
-        )
-        deleted_detections = cursor.rowcount
-        
-        # Затем удаляем само устройство
-        cursor.execute(
-            "DELETE FROM devices WHERE id = ?",
-            (device_id,)
-        )
-        deleted_device = cursor.rowcount
+        deleted = {}
+        for table in _DEVICE_CHILD_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE device_id = ?", (device_id,))
+            deleted[table] = cursor.rowcount
         
-        conn.commit()
+        cursor.execute("DELETE FROM devices WHERE id = ?", (device_id,))
         
-        if deleted_device == 0:
+        if cursor.rowcount == 0:
+            # Неизвестное устройство: ничего не фиксируем
+            conn.rollback()
             raise HTTPException(status_code=404, detail="Device not found")
         
-        print(f"🗑️ Удалено устройство: {device_id} ({deleted_detections} детекций)")
-        
-        return {
-            "message": "Device and associated detections deleted successfully",
-            "deleted_detections": deleted_detections
-        }
-        
-    except Exception as e:
+        conn.commit()
+        return deleted
+    except Exception:
         conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
+
+
+@router.delete("/devices/{device_id}")
+async def delete_device(device_id: str):
+    """Удаление устройства и всех его данных одной транзакцией"""
+    # Детекции из очереди DetectionWriter пишутся до DELETE, а не после
+    # (иначе остались бы сиротами удалённого устройства)
+    await detection_writer.flush()
+    try:
+        deleted = await asyncio.to_thread(_delete_device, device_id)
+    except HTTPException:
+        raise
+    except Exception as e:
         print(f"❌ Ошибка удаления устройства: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
+
+    invalidate_notification_settings(device_id)
+    if deleted["custom_sounds"]:
+        invalidate_custom_centroids(device_id)
+        await invalidate_custom_sounds_cache()
+    
+    deleted_detections = deleted["sound_detections"]
+    print(f"🗑️ Удалено устройство: {device_id} ({deleted_detections} детекций)")
+    
+    return {
+        "message": "Device and associated detections deleted successfully",
+        "deleted_detections": deleted_detections
+    }
@@ -1,21 +1,41 @@
-import sqlite3
+import asyncio
+import itertools
+import os
 import uuid
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Literal, Optional, Tuple
 
 import numpy as np
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request
 
-from backend.api.simple.schemas import AudioData
+from backend.api.simple.schemas import AudioData, AudioMeta
 from backend.api.simple import state
 from backend.api.simple.ws import broadcast_to_websockets
+from backend.database.detection_writer import detection_writer
+from backend.utils.audio import decode_pcm, decode_pcm_base64, prepare_window
 from backend.utils.custom_matching import find_best_custom_match
+from backend.utils.embeddings import embedding_to_blob
+from backend.utils.inference_pool import run_inference
 from backend.utils.notifications import should_send_notification
-from backend.utils.yamnet_cached import extract_embeddings as extract_yamnet_embeddings
+from backend.utils.prediction_cache import (
+    audio_fingerprint,
+    delta_cache,
+    prediction_cache,
+    window_features,
+)
 
 
 router = APIRouter()
 
+# Окна с пиковой амплитудой ниже порога считаем тишиной и не гоняем через YAMNet.
+SILENCE_PEAK_THRESHOLD = float(os.getenv("SILENCE_PEAK_THRESHOLD", "1e-4"))
+
+# id детекции: случайный префикс процесса + счётчик, те же 32 hex-символа,
+# что и uuid4().hex, но без обращения к os.urandom на каждую детекцию.
+# По id детекции ничего не ищется, нужна только уникальность.
+_DETECTION_ID_PREFIX = uuid.uuid4().hex[:16]
+_detection_seq = itertools.count()
+
 
 def _resample_audio_linear(
     audio: np.ndarray, original_rate: int, target_rate: int
@@ -32,141 +52,241 @@ def _resample_audio_linear(
     return np.interp(x_new, xp, audio).astype(np.float32)
 
 
-@router.post("/detect_sound")
-async def detect_sound(audio_data: AudioData) -> Dict[str, Any]:
-    try:
-        if state.model is None:
-            return {"sound_type": "unknown", "confidence": 0.0}
+def _run_model(audio_np: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Blocking YAMNet call; returns (scores, embeddings) as numpy arrays.
 
-        # Конвертируем аудио в numpy array
-        audio_np = np.array(audio_data.audio_data, dtype=np.float32)
-
-        if audio_data.sample_rate != 16000:
-            audio_np = _resample_audio_linear(audio_np, audio_data.sample_rate, 16000)
-            print(f"🔄 Ресемплинг: {audio_data.sample_rate} -> 16000 Hz")
-
-        # YAMNet ожидает аудио длиной 0.96 секунды (15300 сэмплов)
-        # Если аудио короче, дополняем нулями
-        target_length = 15300  # 0.96s * 16000Hz
-        if len(audio_np) < target_length:
-            audio_np = np.pad(
-                audio_np, (0, target_length - len(audio_np)), mode="constant"
-            )
-        elif len(audio_np) > target_length:
-            audio_np = audio_np[:target_length]
+    Repeated windows (same fingerprint) are served from the prediction cache.
+    """
+    key = None
+    if prediction_cache.maxsize > 0:
+        key = audio_fingerprint(audio_np)
+        cached = prediction_cache.get(key)
+        if cached is not None:
+            return cached
 
-        # Детекция
-        scores, embeddings, _spectrogram = state.model(audio_np)
+    scores, embeddings, _spectrogram = state.model(audio_np)
+    # np.asarray covers both eager tensors and the TFLite backend's ndarrays.
+    result = (np.asarray(scores), np.asarray(embeddings))
+    if key is not None:
+        prediction_cache.put(key, result)
+    return result
 
-        scores_np = scores.numpy()
-        print(f"🔍 Размер scores: {scores_np.shape}")
 
-        # Проверяем размер scores
-        if len(scores_np.shape) > 1:
-            scores_np = scores_np.flatten()
+def _analyze(
+    audio_np: np.ndarray,
+    device_id: str,
+    cached: Optional[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+    """Blocking part of a detection in one worker hop.
 
-        if len(scores_np) == 0:
-            print("❌ Пустой массив scores")
-            return {"sound_type": "error", "confidence": 0.0}
+    YAMNet (unless the delta cache already has the window), the mean
+    embedding and the custom-sound search run back to back in the same
+    thread instead of two separate round trips through the event loop.
+    """
+    scores_np, embeddings_np = cached if cached is not None else _run_model(audio_np)
+    embedding_mean = np.mean(embeddings_np, axis=0)
+    custom_match = find_best_custom_match(embedding_mean, device_id, state.db_path)
+    return scores_np, embeddings_np, embedding_mean, custom_match
 
-        max_index = int(np.argmax(scores_np))
-        confidence = float(scores_np[max_index])
 
-        # Проверяем индекс
-        if max_index >= len(state.class_names):
-            print(
-                f"❌ Индекс {max_index} больше количества классов {len(state.class_names)}"
-            )
-            max_index = 0
+async def _store_and_broadcast(
+    audio_data: AudioMeta,
+    sound_type: str,
+    confidence: float,
+    embedding_mean: Optional[np.ndarray],
+    custom_sound_type: Optional[str],
+) -> Dict[str, Any]:
+    is_custom = custom_sound_type is not None
+
+    # Сохраняем детекцию (пишется пачкой фоновым DetectionWriter)
+    detection_id = f"{_DETECTION_ID_PREFIX}{next(_detection_seq):016x}"
+    timestamp = audio_data.timestamp or datetime.now().isoformat()
 
-        sound_type = (
-            state.class_names[max_index]
-            if max_index < len(state.class_names)
-            else "unknown"
+    detection_writer.submit(
+        (
+            detection_id,
+            audio_data.device_id,
+            sound_type,
+            confidence,
+            timestamp,
+            embedding_to_blob(embedding_mean),
+        ),
+    )
+
+    should_notify = (
+        (custom_sound_type == "specific")
+        if is_custom
+        else await asyncio.to_thread(
+            should_send_notification,
+            state.db_path,
+            audio_data.device_id,
+            sound_type,
         )
+    )
+
+    await broadcast_to_websockets(
+        {
+            "type": "sound_detected",
+            "device_id": audio_data.device_id,
+            "sound_type": sound_type,
+            "confidence": confidence,
+            "timestamp": timestamp,
+            "should_notify": should_notify,
+            "is_custom": is_custom,
+            "custom_sound_type": custom_sound_type,
+            "db_level": audio_data.db_level,
+        }
+    )
+
+    return {"sound_type": sound_type, "confidence": confidence}
+
+
+async def _detect(audio_np: np.ndarray, audio_data: AudioMeta) -> Dict[str, Any]:
+    """Общий конвейер для JSON и бинарного эндпоинтов; аудио уже float32."""
+    if audio_data.sample_rate != 16000:
+        audio_np = _resample_audio_linear(audio_np, audio_data.sample_rate, 16000)
+        print(f"🔄 Ресемплинг: {audio_data.sample_rate} -> 16000 Hz")
+
+    # YAMNet ожидает аудио длиной 0.96 секунды (15300 сэмплов): всегда одна
+    # и та же форма входа, без перетрассировки tf.function
+    audio_np = prepare_window(audio_np)
 
-        # Custom sounds matching using embeddings centroid similarity.
-        embedding_mean = np.mean(embeddings.numpy(), axis=0).tolist()
-        custom_match = find_best_custom_match(
-            embedding_mean, audio_data.device_id, state.db_path
+    # Дешёвый амплитудный гейт: цифровая тишина (нулевое/почти нулевое окно)
+    # не доходит ни до модели, ни до БД, ни до WebSocket-клиентов
+    peak = float(max(audio_np.max(), -audio_np.min()))
+    if peak < SILENCE_PEAK_THRESHOLD:
+        return {"sound_type": "Silence", "confidence": 1.0}
+
+    # Детекция (в пуле инференса, чтобы не блокировать event loop).
+    # Опционально: окно почти как предыдущее у этого устройства -> без модели.
+    cached = None
+    if delta_cache.enabled:
+        rms, zcr = window_features(audio_np)
+        cached = delta_cache.get(audio_data.device_id, rms, zcr)
+    if cached is not None:
+        # Модель не нужна: только custom matching, вне пула инференса
+        result = await asyncio.to_thread(
+            _analyze, audio_np, audio_data.device_id, cached
         )
+    else:
+        result = await run_inference(_analyze, audio_np, audio_data.device_id, None)
+    scores_np, embeddings_np, embedding_mean, custom_match = result
+    if cached is None and delta_cache.enabled:
+        delta_cache.put(audio_data.device_id, rms, zcr, (scores_np, embeddings_np))
+    print(f"🔍 Размер scores: {scores_np.shape}")
+
+    # Проверяем размер scores
+    if len(scores_np.shape) > 1:
+        scores_np = scores_np.flatten()
+
+    if len(scores_np) == 0:
+        print("❌ Пустой массив scores")
+        return {"sound_type": "error", "confidence": 0.0}
+
+    max_index = int(np.argmax(scores_np))
+    confidence = float(scores_np[max_index])
 
-        is_custom = False
-        custom_sound_type = None
-        if custom_match:
-            similarity = float(custom_match.get("similarity", 0.0) or 0.0)
-            threshold = float(custom_match.get("threshold", 0.7) or 0.7)
-
-            # Additional validation: require minimum similarity for specific sounds
-            if custom_match.get("sound_type") == "specific" and similarity >= threshold:
-                is_custom = True
-                custom_sound_type = custom_match.get("sound_type")
-                sound_type = custom_match.get("name", sound_type)
-                confidence = similarity
-                print(f"   {sound_type}: {similarity:.3f} (threshold: {threshold:.3f})")
-            elif (
-                custom_match.get("sound_type") == "excluded" and similarity >= threshold
-            ):
-                # For excluded sounds, we can be slightly more lenient
-                is_custom = True
-                custom_sound_type = custom_match.get("sound_type")
-                sound_type = custom_match.get("name", sound_type)
-                confidence = similarity
-                print(f"   {sound_type}: {similarity:.3f} (threshold: {threshold:.3f})")
-            else:
-                print(
-                    f"   {custom_match.get('name', 'unknown')}: {similarity:.3f} (below threshold: {threshold:.3f})"
-                )
-
-        # Сохраняем детекцию
-        detection_id = str(uuid.uuid4())
-        conn = sqlite3.connect(state.db_path)
-        cursor = conn.cursor()
-
-        timestamp = audio_data.timestamp or datetime.now().isoformat()
-
-        cursor.execute(
-            """
-            INSERT INTO sound_detections 
-            (id, device_id, sound_type, confidence, timestamp, embeddings)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                detection_id,
-                audio_data.device_id,
-                sound_type,
-                confidence,
-                timestamp,
-                str(embedding_mean),
-            ),
+    # Проверяем индекс
+    if max_index >= len(state.class_names):
+        print(
+            f"❌ Индекс {max_index} больше количества классов {len(state.class_names)}"
         )
+        max_index = 0
+
+    sound_type = (
+        state.class_names[max_index]
+        if max_index < len(state.class_names)
+        else "unknown"
+    )
 
-        conn.commit()
-        conn.close()
+    # Custom sounds matching using embeddings centroid similarity
+    # (already computed by _analyze).
+    is_custom = False
+    custom_sound_type = None
+    if custom_match:
+        similarity = float(custom_match.get("similarity", 0.0) or 0.0)
+        threshold = float(custom_match.get("threshold", 0.7) or 0.7)
 
-        should_notify = (
-            (custom_sound_type == "specific")
-            if is_custom
-            else should_send_notification(
-                state.db_path, audio_data.device_id, sound_type
+        # Additional validation: require minimum similarity for specific sounds
+        if custom_match.get("sound_type") == "specific" and similarity >= threshold:
+            is_custom = True
+            custom_sound_type = custom_match.get("sound_type")
+            sound_type = custom_match.get("name", sound_type)
+            confidence = similarity
+            print(f"   {sound_type}: {similarity:.3f} (threshold: {threshold:.3f})")
+        elif (
+            custom_match.get("sound_type") == "excluded" and similarity >= threshold
+        ):
+            # For excluded sounds, we can be slightly more lenient
+            is_custom = True
+            custom_sound_type = custom_match.get("sound_type")
+            sound_type = custom_match.get("name", sound_type)
+            confidence = similarity
+            print(f"   {sound_type}: {similarity:.3f} (threshold: {threshold:.3f})")
+        else:
+            print(
+                f"   {custom_match.get('name', 'unknown')}: {similarity:.3f} (below threshold: {threshold:.3f})"
             )
-        )
 
-        await broadcast_to_websockets(
-            {
-                "type": "sound_detected",
-                "device_id": audio_data.device_id,
-                "sound_type": sound_type,
-                "confidence": confidence,
-                "timestamp": timestamp,
-                "should_notify": should_notify,
-                "is_custom": is_custom,
-                "custom_sound_type": custom_sound_type,
-                "db_level": audio_data.db_level,
-            }
-        )
+    return await _store_and_broadcast(
+        audio_data,
+        sound_type,
+        confidence,
+        embedding_mean,
+        custom_sound_type,
+    )
+
+
+@router.post("/detect_sound")
+async def detect_sound(audio_data: AudioData) -> Dict[str, Any]:
+    try:
+        if state.model is None:
+            return {"sound_type": "unknown", "confidence": 0.0}
+
+        # Конвертируем аудио в numpy array
+        if audio_data.audio_b64 is not None:
+            audio_np = decode_pcm_base64(audio_data.audio_b64, audio_data.audio_dtype)
+        else:
+            # Сразу во float32, без промежуточного float64 массива
+            audio_np = np.asarray(audio_data.audio_data, dtype=np.float32)
 
-        return {"sound_type": sound_type, "confidence": confidence}
+        return await _detect(audio_np, audio_data)
+    except Exception as e:
+        print(f"❌ Ошибка детекции: {e}")
+        return {"sound_type": "error", "confidence": 0.0}
+
+
+@router.post("/detect_sound_raw")
+async def detect_sound_raw(
+    request: Request,
+    device_id: str,
+    sample_rate: int = 16000,
+    channels: int = Query(default=1, ge=1),
+    dtype: Literal["int16", "float32"] = "float32",
+    db_level: Optional[float] = None,
+    timestamp: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Детекция по сырому little-endian PCM (float32 или int16) в теле запроса.
+
+    Без JSON-списка и валидации каждого сэмпла: тело сразу становится
+    numpy-массивом через np.frombuffer. int16 вдвое короче float32 и
+    масштабируется в [-1, 1) одним векторным умножением. Многоканальное
+    (interleaved) аудио сводится к первому каналу одним strided-срезом.
+    """
+    try:
+        if state.model is None:
+            return {"sound_type": "unknown", "confidence": 0.0}
+
+        audio_np = decode_pcm(await request.body(), dtype)
+        if channels > 1:
+            audio_np = audio_np.reshape(-1, channels)[:, 0]
+        meta = AudioMeta(
+            device_id=device_id,
+            sample_rate=sample_rate,
+            db_level=db_level,
+            timestamp=timestamp,
+        )
+        return await _detect(audio_np, meta)
     except Exception as e:
         print(f"❌ Ошибка детекции: {e}")
         return {"sound_type": "error", "confidence": 0.0}
@@ -1,16 +1,16 @@
-import sqlite3
-import json
 from fastapi import APIRouter, HTTPException, Query
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.utils.embeddings import embedding_from_db
 
 router = APIRouter()
 
 @router.get("/detections/{device_id}")
 async def get_detections(device_id: str, limit: int = Query(default=1000, le=10000)):
     """Получение детекций для устройства"""
+    conn = get_connection(state.db_path)
     try:
-        conn = sqlite3.connect(state.db_path)
         cursor = conn.cursor()
         
         # Проверяем существует ли устройство
@@ -38,7 +38,7 @@ async def get_detections(device_id: str, limit: int = Query(default=1000, le=100
                 "sound_type": row[2],
                 "confidence": row[3],
                 "timestamp": row[4],
-                "embeddings": json.loads(row[5]) if row[5] else [],
+                "embeddings": embedding_from_db(row[5]),
             })
         
         # Получаем общее количество
@@ -48,7 +48,6 @@ async def get_detections(device_id: str, limit: int = Query(default=1000, le=100
         )
         total_count = cursor.fetchone()[0]
         
-        conn.close()
         
         return {"detections": detections, "total_count": total_count}
         
@@ -57,3 +56,5 @@ async def get_detections(device_id: str, limit: int = Query(default=1000, le=100
     except Exception as e:
         print(f"❌ Error getting detections: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_connection(conn)
@@ -3,6 +3,7 @@ from datetime import datetime
 from fastapi import APIRouter
 
 from backend.api.simple import state
+from backend.utils.prediction_cache import delta_cache, prediction_cache
 
 
 router = APIRouter()
@@ -14,6 +15,8 @@ async def health_check():
         "status": "healthy",
         "model_loaded": state.model is not None,
         "devices_connected": len(state.websocket_connections),
+        "prediction_cache": prediction_cache.stats(),
+        "delta_cache": delta_cache.stats(),
         "timestamp": datetime.now().isoformat(),
     }
 
@@ -1,16 +1,16 @@
-import sqlite3
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
 
 
 router = APIRouter()
 
 
-@router.get("/notification_settings/{device_id}")
-async def get_notification_settings(device_id: str):
-    """Получение настроек уведомлений для устройства"""
-    conn = sqlite3.connect(state.db_path)
+def _fetch_settings(device_id: str) -> dict:
+    conn = get_connection(state.db_path)
     cursor = conn.cursor()
     
     try:
@@ -64,12 +64,18 @@ async def get_notification_settings(device_id: str):
             "custom_sounds": custom_sounds,
             "min_confidence": 0.3
         }
-        
+    finally:
+        release_connection(conn)
+
+
+@router.get("/notification_settings/{device_id}")
+async def get_notification_settings(device_id: str):
+    """Получение настроек уведомлений для устройства"""
+    try:
+        return await asyncio.to_thread(_fetch_settings, device_id)
     except Exception as e:
         print(f"❌ Ошибка получения настроек: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
 
 
 @router.post("/notification_settings/{device_id}")
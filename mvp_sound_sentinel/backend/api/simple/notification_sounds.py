@@ -1,10 +1,12 @@
-import sqlite3
+import asyncio
 import uuid
 from datetime import datetime
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.utils.notifications import invalidate_notification_settings
 
 router = APIRouter()
 
@@ -15,46 +17,47 @@ class NotificationSound(BaseModel):
     device_id: str
 
 
-@router.post("/notification_sounds")
-async def add_notification_sound(sound: NotificationSound):
-    """Добавление важного звука для уведомлений"""
+def _insert_sound(sound_id: str, name: str, device_id: str) -> None:
+    conn = get_connection(state.db_path)
     try:
-        conn = sqlite3.connect(state.db_path)
-        cursor = conn.cursor()
-
-        sound_id = str(uuid.uuid4())
-        resolved_name = (sound.name or sound.sound_name or "").strip()
-        if not resolved_name:
-            raise HTTPException(status_code=400, detail="sound name is required")
-
-        cursor.execute(
+        conn.execute(
             """
             INSERT OR REPLACE INTO notification_sounds (id, sound_name, device_id, created_at)
             VALUES (?, ?, ?, ?)
             """,
-            (sound_id, resolved_name, sound.device_id, datetime.now().isoformat()),
+            (sound_id, name, device_id, datetime.now().isoformat()),
         )
-
         conn.commit()
-        conn.close()
+    finally:
+        release_connection(conn)
 
-        print(f"🔔 Added notification sound: {resolved_name}")
 
-        return {"sound_id": sound_id, "status": "added"}
+@router.post("/notification_sounds")
+async def add_notification_sound(sound: NotificationSound):
+    """Добавление важного звука для уведомлений"""
+    sound_id = str(uuid.uuid4())
+    resolved_name = (sound.name or sound.sound_name or "").strip()
+    if not resolved_name:
+        raise HTTPException(status_code=400, detail="sound name is required")
 
+    try:
+        await asyncio.to_thread(
+            _insert_sound, sound_id, resolved_name, sound.device_id
+        )
     except Exception as e:
         print(f"❌ Error adding notification sound: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    invalidate_notification_settings(sound.device_id)
+    print(f"🔔 Added notification sound: {resolved_name}")
 
-@router.get("/notification_sounds/{device_id}")
-async def get_notification_sounds(device_id: str):
-    """Получение важных звуков для устройства"""
-    try:
-        conn = sqlite3.connect(state.db_path)
-        cursor = conn.cursor()
+    return {"sound_id": sound_id, "status": "added"}
 
-        cursor.execute(
+
+def _fetch_sounds(device_id: str) -> list[dict]:
+    conn = get_connection(state.db_path)
+    try:
+        cursor = conn.execute(
             """
             SELECT id, sound_name, device_id, created_at
             FROM notification_sounds 
@@ -63,47 +66,54 @@ async def get_notification_sounds(device_id: str):
             """,
             (device_id,),
         )
+        return [
+            {
+                "id": row[0],
+                "name": row[1],
+                "device_id": row[2],
+                "created_at": row[3],
+            }
+            for row in cursor.fetchall()
+        ]
+    finally:
+        release_connection(conn)
 
-        sounds = []
-        for row in cursor.fetchall():
-            sounds.append(
-                {
-                    "id": row[0],
-                    "name": row[1],
-                    "device_id": row[2],
-                    "created_at": row[3],
-                }
-            )
-
-        conn.close()
-        return sounds
 
+@router.get("/notification_sounds/{device_id}")
+async def get_notification_sounds(device_id: str):
+    """Получение важных звуков для устройства"""
+    try:
+        return await asyncio.to_thread(_fetch_sounds, device_id)
     except Exception as e:
         print(f"❌ Error getting notification sounds: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/notification_sounds/{sound_id}")
-async def delete_notification_sound(sound_id: str):
-    """Удаление важного звука"""
+def _delete_sound(sound_id: str) -> int:
+    conn = get_connection(state.db_path)
     try:
-        conn = sqlite3.connect(state.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM notification_sounds WHERE id = ?", (sound_id,))
-
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail="Sound not found")
-
+        cursor = conn.execute(
+            "DELETE FROM notification_sounds WHERE id = ?", (sound_id,)
+        )
         conn.commit()
-        conn.close()
-
-        print(f"🗑️ Deleted notification sound: {sound_id}")
+        return cursor.rowcount
+    finally:
+        release_connection(conn)
 
-        return {"status": "deleted"}
 
-    except HTTPException:
-        raise
+@router.delete("/notification_sounds/{sound_id}")
+async def delete_notification_sound(sound_id: str):
+    """Удаление важного звука"""
+    try:
+        deleted = await asyncio.to_thread(_delete_sound, sound_id)
     except Exception as e:
         print(f"❌ Error deleting notification sound: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    if deleted == 0:
+        raise HTTPException(status_code=404, detail="Sound not found")
+
+    invalidate_notification_settings()
+    print(f"🗑️ Deleted notification sound: {sound_id}")
+
+    return {"status": "deleted"}
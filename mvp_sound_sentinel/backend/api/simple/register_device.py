@@ -1,74 +1,81 @@
-import sqlite3
+import asyncio
 import uuid
-from datetime import datetime
 
 from fastapi import APIRouter
 
 from backend.api.simple.schemas import DeviceRegistration
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.database.schema import NOW_ISO_SQL
 from backend.api.simple.ws import broadcast_to_websockets
 
 
 router = APIRouter()
 
 
-@router.post("/register_device")
-async def register_device(device: DeviceRegistration):
-    conn = sqlite3.connect(state.db_path)
-    cursor = conn.cursor()
-
-    # Проверяем, существует ли устройство с таким MAC адресом
-    cursor.execute(
-        "SELECT id FROM devices WHERE mac_address = ?", (device.mac_address,)
-    )
-    existing_device = cursor.fetchone()
+def _save_registration(device: DeviceRegistration) -> str:
+    """Создание/обновление устройства по MAC; возвращает его id"""
+    conn = get_connection(state.db_path)
+    try:
+        cursor = conn.cursor()
 
-    if existing_device:
-        # Устройство уже существует, обновляем его
-        device_id = existing_device[0]
-        cursor.execute(
-            """
-            UPDATE devices 
-            SET ip_address = ?, name = ?, model = ?, microphone_info = ?, 
-                wifi_signal = ?, status = 'online', last_seen = ?
-            WHERE id = ?
-            """,
-            (
-                device.ip_address,
-                device.name,
-                device.model,
-                device.microphone_info,
-                device.wifi_signal,
-                datetime.now().isoformat(),
-                device_id,
-            ),
-        )
-        print(f"🔄 Устройство обновлено: {device.name} (ID: {device_id})")
-    else:
-        # Новое устройство
-        device_id = str(uuid.uuid4())
+        # Проверяем, существует ли устройство с таким MAC адресом
         cursor.execute(
-            """
-            INSERT INTO devices 
-            (id, name, ip_address, mac_address, model, model_image_url, microphone_info, wifi_signal, status, last_seen)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'online', ?)
-            """,
-            (
-                device_id,
-                device.name,
-                device.ip_address,
-                device.mac_address,
-                device.model,
-                device.model_image_url,
-                device.microphone_info,
-                device.wifi_signal,
-                datetime.now().isoformat(),
-            ),
+            "SELECT id FROM devices WHERE mac_address = ?", (device.mac_address,)
         )
-        print(f"🆕 Новое устройство: {device.name} (ID: {device_id})")
+        existing_device = cursor.fetchone()
 
-    conn.commit()
-    conn.close()
+        if existing_device:
+            # Устройство уже существует, обновляем его
+            device_id = existing_device[0]
+            cursor.execute(
+                f"""
+                UPDATE devices 
+                SET ip_address = ?, name = ?, model = ?, microphone_info = ?, 
+                    wifi_signal = ?, status = 'online', last_seen = {NOW_ISO_SQL}
+                WHERE id = ?
+                """,
+                (
+                    device.ip_address,
+                    device.name,
+                    device.model,
+                    device.microphone_info,
+                    device.wifi_signal,
+                    device_id,
+                ),
+            )
+            print(f"🔄 Устройство обновлено: {device.name} (ID: {device_id})")
+        else:
+            # Новое устройство
+            device_id = uuid.uuid4().hex
+            cursor.execute(
+                f"""
+                INSERT INTO devices 
+                (id, name, ip_address, mac_address, model, model_image_url, microphone_info, wifi_signal, status, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'online', {NOW_ISO_SQL})
+                """,
+                (
+                    device_id,
+                    device.name,
+                    device.ip_address,
+                    device.mac_address,
+                    device.model,
+                    device.model_image_url,
+                    device.microphone_info,
+                    device.wifi_signal,
+                ),
+            )
+            print(f"🆕 Новое устройство: {device.name} (ID: {device_id})")
+
+        conn.commit()
+    finally:
+        release_connection(conn)
+    return device_id
+
+
+@router.post("/register_device")
+async def register_device(device: DeviceRegistration):
+    device_id = await asyncio.to_thread(_save_registration, device)
 
     await broadcast_to_websockets(
         {"type": "device_registered", "device": device.dict()}
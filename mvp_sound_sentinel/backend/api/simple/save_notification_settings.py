@@ -4,14 +4,16 @@ Save Notification Settings API
 Эндпоинт для сохранения настроек уведомлений
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-import sqlite3
 import uuid
 from datetime import datetime
 
-from backend.api.simple.state import db_path
+from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.utils.notifications import invalidate_notification_settings
 
 router = APIRouter()
 
@@ -27,10 +29,9 @@ class SoundItem(BaseModel):
     name: str
 
 
-@router.post("/notification_settings/{device_id}")
-async def save_notification_settings(device_id: str, settings: NotificationSettings):
-    """Сохранение настроек уведомлений для устройства"""
-    conn = sqlite3.connect(db_path)
+def _replace_settings(device_id: str, settings: NotificationSettings) -> None:
+    """Замена списков важных/исключенных звуков устройства одной транзакцией"""
+    conn = get_connection(state.db_path)
     cursor = conn.cursor()
 
     try:
@@ -46,39 +47,53 @@ async def save_notification_settings(device_id: str, settings: NotificationSetti
         cursor.execute("DELETE FROM excluded_sounds WHERE device_id = ?", (device_id,))
 
         # Добавляем важные звуки
-        for sound in settings.notification_sounds:
-            sound_id = sound.get("id") or str(uuid.uuid4())
-            cursor.execute(
-                """
-                INSERT INTO notification_sounds (id, sound_name, device_id)
-                VALUES (?, ?, ?)
-                """,
-                (sound_id, sound["name"], device_id),
-            )
+        cursor.executemany(
+            """
+            INSERT INTO notification_sounds (id, sound_name, device_id)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (sound.get("id") or str(uuid.uuid4()), sound["name"], device_id)
+                for sound in settings.notification_sounds
+            ],
+        )
 
         # Добавляем исключенные звуки
-        for sound in settings.excluded_sounds:
-            sound_id = sound.get("id") or str(uuid.uuid4())
-            cursor.execute(
-                """
-                INSERT INTO excluded_sounds (id, sound_name, device_id)
-                VALUES (?, ?, ?)
-                """,
-                (sound_id, sound["name"], device_id),
-            )
+        cursor.executemany(
+            """
+            INSERT INTO excluded_sounds (id, sound_name, device_id)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (sound.get("id") or str(uuid.uuid4()), sound["name"], device_id)
+                for sound in settings.excluded_sounds
+            ],
+        )
 
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
 
-        return {
-            "status": "success",
-            "message": "Notification settings saved successfully",
-            "notification_sounds_count": len(settings.notification_sounds),
-            "excluded_sounds_count": len(settings.excluded_sounds),
-            "min_confidence": settings.min_confidence,
-        }
 
+@router.post("/notification_settings/{device_id}")
+async def save_notification_settings(device_id: str, settings: NotificationSettings):
+    """Сохранение настроек уведомлений для устройства"""
+    try:
+        await asyncio.to_thread(_replace_settings, device_id, settings)
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
+
+    invalidate_notification_settings(device_id)
+
+    return {
+        "status": "success",
+        "message": "Notification settings saved successfully",
+        "notification_sounds_count": len(settings.notification_sounds),
+        "excluded_sounds_count": len(settings.excluded_sounds),
+        "min_confidence": settings.min_confidence,
+    }
@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 class DeviceRegistration(BaseModel):
@@ -14,12 +14,26 @@ class DeviceRegistration(BaseModel):
     wifi_signal: int = 0
 
 
-class AudioData(BaseModel):
+class AudioMeta(BaseModel):
+    """Everything about an audio window except the samples themselves."""
+
     device_id: str
-    audio_data: List[float]
     sample_rate: int = 16000
     db_level: Optional[float] = None
     # main_simple historically accessed `audio_data.timestamp` even though
     # the schema didn't include it. Keep it optional for compatibility.
     timestamp: Optional[str] = None
 
+
+class AudioData(AudioMeta):
+    audio_data: Optional[List[float]] = None
+    # Compact alternative to `audio_data`: base64 little-endian PCM samples.
+    audio_b64: Optional[str] = None
+    audio_dtype: Literal["int16", "float32"] = "float32"
+
+    @model_validator(mode="after")
+    def _one_audio_source(self) -> "AudioData":
+        if (self.audio_data is None) == (self.audio_b64 is None):
+            raise ValueError("exactly one of audio_data or audio_b64 is required")
+        return self
+
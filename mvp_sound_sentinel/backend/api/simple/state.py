@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, List, Set
+from typing import Any, Set, Tuple
 
 
 # Shared server state for main_simple handlers.
 # Lifespan in `backend/main_simple.py` initializes these fields.
 db_path: str = "soundsentinel.db"
 model: Any = None
-class_names: List[str] = []
+class_names: Tuple[str, ...] = ()
 websocket_connections: Set[Any] = set()
 
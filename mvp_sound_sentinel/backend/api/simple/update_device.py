@@ -1,10 +1,11 @@
-import sqlite3
+import asyncio
 from datetime import datetime
 from fastapi import APIRouter, HTTPException
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
 
 router = APIRouter()
 
@@ -15,49 +16,46 @@ class DeviceUpdate(BaseModel):
     last_seen: Optional[str] = None
 
 
-@router.put("/devices/{device_id}")
-async def update_device(device_id: str, device_update: DeviceUpdate):
-    """Обновление информации об устройстве"""
+def _save_device(device_id: str, updates: List[str], params: list) -> int:
+    conn = get_connection(state.db_path)
     try:
-        conn = sqlite3.connect(state.db_path)
-        cursor = conn.cursor()
-
-        # Определяем какие поля нужно обновить
-        updates = []
-        params = []
-
-        if device_update.name is not None:
-            updates.append("name = ?")
-            params.append(device_update.name)
-
-        if device_update.status is not None:
-            updates.append("status = ?")
-            params.append(device_update.status)
-
-        if device_update.last_seen is not None:
-            updates.append("last_seen = ?")
-            params.append(device_update.last_seen)
+        query = f"UPDATE devices SET {', '.join(updates)} WHERE id = ?"
+        cursor = conn.execute(query, [*params, device_id])
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        release_connection(conn)
 
-        if not updates:
-            raise HTTPException(status_code=400, detail="No fields to update")
 
-        # Добавляем device_id в параметры
-        params.append(device_id)
+@router.put("/devices/{device_id}")
+async def update_device(device_id: str, device_update: DeviceUpdate):
+    """Обновление информации об устройстве"""
+    # Определяем какие поля нужно обновить
+    updates = []
+    params = []
 
-        # Выполняем обновление
-        query = f"UPDATE devices SET {', '.join(updates)} WHERE id = ?"
-        cursor.execute(query, params)
+    if device_update.name is not None:
+        updates.append("name = ?")
+        params.append(device_update.name)
 
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail="Device not found")
+    if device_update.status is not None:
+        updates.append("status = ?")
+        params.append(device_update.status)
 
-        conn.commit()
-        conn.close()
+    if device_update.last_seen is not None:
+        updates.append("last_seen = ?")
+        params.append(device_update.last_seen)
 
-        return {"status": "updated", "device_id": device_id}
+    if not updates:
+        raise HTTPException(status_code=400, detail="No fields to update")
 
-    except HTTPException:
-        raise
+    try:
+        updated = await asyncio.to_thread(_save_device, device_id, updates, params)
     except Exception as e:
         print(f"❌ Error updating device: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    if updated == 0:
+        raise HTTPException(status_code=404, detail="Device not found")
+
+    return {"status": "updated", "device_id": device_id}
@@ -4,16 +4,44 @@ Update Device Info API
 Эндпоинт для обновления информации об устройстве (WiFi, микрофон и т.д.)
 """
 
+import asyncio
+
 from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
-from typing import Optional
-import sqlite3
-from datetime import datetime
+from typing import List, Optional, Set, Tuple
 
 from backend.api.simple import state
+from backend.database.connection import get_connection, release_connection
+from backend.database.schema import NOW_ISO_SQL
 
 router = APIRouter()
 
+# Постоянный текст запросов: кэш подготовленных выражений соединения
+# (cached_statements) переиспользует их без повторного разбора SQL.
+DEVICE_EXISTS_SQL = "SELECT COUNT(*) FROM devices WHERE id = ?"
+
+INSERT_DEVICE_INFO_SQL = f"""
+    INSERT INTO devices (id, name, ip_address, mac_address, model, wifi_signal, cpu_usage, device_temperature, microphone_info, last_seen)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, {NOW_ISO_SQL}))
+"""
+
+# Один UPDATE на любой набор полей: COALESCE(?, col) сохраняет текущее
+# значение, если поле не передано. last_seen обновляется всегда: время
+# клиента или текущее время SQLite.
+UPDATE_DEVICE_INFO_SQL = f"""
+    UPDATE devices SET
+        name = COALESCE(?, name),
+        ip_address = COALESCE(?, ip_address),
+        mac_address = COALESCE(?, mac_address),
+        model = COALESCE(?, model),
+        wifi_signal = COALESCE(?, wifi_signal),
+        cpu_usage = COALESCE(?, cpu_usage),
+        device_temperature = COALESCE(?, device_temperature),
+        microphone_info = COALESCE(?, microphone_info),
+        last_seen = COALESCE(?, {NOW_ISO_SQL})
+    WHERE id = ?
+"""
+
 
 class DeviceInfoUpdate(BaseModel):
     name: Optional[str] = None
@@ -27,31 +55,43 @@ class DeviceInfoUpdate(BaseModel):
     last_seen: Optional[str] = None
 
 
-@router.put("/update_device/{device_id}")
-async def update_device_info(
-    device_id: str,
-    device_update: DeviceInfoUpdate,
-    x_device_id: Optional[str] = Header(default=None),
-):
-    """Update device information (WiFi, microphone, etc.)"""
-    if x_device_id and x_device_id != device_id:
-        raise HTTPException(status_code=403, detail="Device ID mismatch")
+class DeviceInfoBulkItem(DeviceInfoUpdate):
+    device_id: str
+
+
+# Строк на один executemany; все пачки идут в одной транзакции
+BULK_UPDATE_CHUNK = 100
+
 
+def _update_params(device_id: str, device_update: DeviceInfoUpdate) -> tuple:
+    return (
+        device_update.name,
+        device_update.ip_address,
+        device_update.mac_address,
+        device_update.model,
+        device_update.wifi_signal,
+        device_update.cpu_usage,
+        device_update.device_temperature,
+        device_update.microphone_info,
+        device_update.last_seen,
+        device_id,
+    )
+
+
+def _save_device_info(device_id: str, device_update: DeviceInfoUpdate) -> None:
+    """Создание/обновление строки устройства (блокирующий SQLite, в потоке)"""
+    conn = get_connection(state.db_path)
     try:
-        conn = sqlite3.connect(state.db_path)
         cursor = conn.cursor()
 
         # Проверяем существует ли устройство
-        cursor.execute("SELECT COUNT(*) FROM devices WHERE id = ?", (device_id,))
+        cursor.execute(DEVICE_EXISTS_SQL, (device_id,))
         device_exists = cursor.fetchone()[0] > 0
 
         if not device_exists:
             # Создаем устройство если его нет
             cursor.execute(
-                """
-                INSERT INTO devices (id, name, ip_address, mac_address, model, wifi_signal, cpu_usage, device_temperature, microphone_info, last_seen)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                INSERT_DEVICE_INFO_SQL,
                 (
                     device_id,
                     device_update.name or f"Device {device_id[:8]}",
@@ -62,73 +102,47 @@ async def update_device_info(
                     device_update.cpu_usage,
                     device_update.device_temperature,
                     device_update.microphone_info or "Unknown",
-                    device_update.last_seen or datetime.now().isoformat(),
+                    device_update.last_seen,
                 ),
             )
             print(f"✅ Устройство создано: {device_id}")
         else:
-            # Обновляем существующее устройство
-            update_fields = []
-            update_values = []
-
-            if device_update.name is not None:
-                update_fields.append("name = ?")
-                update_values.append(device_update.name)
+            # Обновляем существующее устройство: None оставляет поле как есть
+            cursor.execute(
+                UPDATE_DEVICE_INFO_SQL, _update_params(device_id, device_update)
+            )
 
-            if device_update.ip_address is not None:
-                update_fields.append("ip_address = ?")
-                update_values.append(device_update.ip_address)
+            # Логируем WiFi|CPU|Температуру если они есть
+            log_parts = []
+            if device_update.wifi_signal is not None:
+                log_parts.append(f"WiFi {device_update.wifi_signal}%")
+            if device_update.cpu_usage is not None:
+                log_parts.append(f"CPU {device_update.cpu_usage:.1f}%")
+            if device_update.device_temperature is not None:
+                log_parts.append(f"Temp {device_update.device_temperature:.1f}°C")
 
-            if device_update.mac_address is not None:
-                update_fields.append("mac_address = ?")
-                update_values.append(device_update.mac_address)
+            if log_parts:
+                print(f"PUT success: {' | '.join(log_parts)}")
 
-            if device_update.model is not None:
-                update_fields.append("model = ?")
-                update_values.append(device_update.model)
+            print(f"Device updated: {device_id}")
 
-            if device_update.wifi_signal is not None:
-                update_fields.append("wifi_signal = ?")
-                update_values.append(device_update.wifi_signal)
+        conn.commit()
+    finally:
+        release_connection(conn)
 
-            if device_update.cpu_usage is not None:
-                update_fields.append("cpu_usage = ?")
-                update_values.append(device_update.cpu_usage)
 
-            if device_update.device_temperature is not None:
-                update_fields.append("device_temperature = ?")
-                update_values.append(device_update.device_temperature)
-
-            if device_update.microphone_info is not None:
-                update_fields.append("microphone_info = ?")
-                update_values.append(device_update.microphone_info)
-
-            # Всегда обновляем last_seen
-            update_fields.append("last_seen = ?")
-            update_values.append(device_update.last_seen or datetime.now().isoformat())
-
-            if update_fields:
-                query = f"UPDATE devices SET {', '.join(update_fields)} WHERE id = ?"
-                update_values.append(device_id)
-                cursor.execute(query, (*update_values,))
-
-                # Логируем WiFi|CPU|Температуру если они есть
-                log_parts = []
-                if device_update.wifi_signal is not None:
-                    log_parts.append(f"WiFi {device_update.wifi_signal}%")
-                if device_update.cpu_usage is not None:
-                    log_parts.append(f"CPU {device_update.cpu_usage:.1f}%")
-                if device_update.device_temperature is not None:
-                    log_parts.append(f"Temp {device_update.device_temperature:.1f}°C")
-
-                if log_parts:
-                    print(f"PUT success: {' | '.join(log_parts)}")
-
-                print(f"Device updated: {device_id}")
-            else:
-                print(f"No fields to update for device: {device_id}")
+@router.put("/update_device/{device_id}")
+async def update_device_info(
+    device_id: str,
+    device_update: DeviceInfoUpdate,
+    x_device_id: Optional[str] = Header(default=None),
+):
+    """Update device information (WiFi, microphone, etc.)"""
+    if x_device_id and x_device_id != device_id:
+        raise HTTPException(status_code=403, detail="Device ID mismatch")
 
-        conn.commit()
+    try:
+        await asyncio.to_thread(_save_device_info, device_id, device_update)
 
         # Отправляем WebSocket обновление
         from backend.api.simple.ws import broadcast_to_websockets
@@ -146,5 +160,64 @@ async def update_device_info(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _save_devices_bulk(items: List[DeviceInfoBulkItem]) -> Tuple[int, Set[str]]:
+    """Обновление многих устройств одним commit.
+
+    Возвращает число обновлённых строк и id устройств, которые есть в БД
+    (выбраны в той же транзакции, что и UPDATE).
+    """
+    conn = get_connection(state.db_path)
+    try:
+        updated = 0
+        existing: Set[str] = set()
+        for start in range(0, len(items), BULK_UPDATE_CHUNK):
+            chunk = items[start : start + BULK_UPDATE_CHUNK]
+            cursor = conn.executemany(
+                UPDATE_DEVICE_INFO_SQL,
+                [_update_params(item.device_id, item) for item in chunk],
+            )
+            updated += cursor.rowcount
+            ids = [item.device_id for item in chunk]
+            placeholders = ", ".join("?" * len(ids))
+            existing.update(
+                row[0]
+                for row in conn.execute(
+                    f"SELECT id FROM devices WHERE id IN ({placeholders})", ids
+                )
+            )
+        conn.commit()
+        return updated, existing
     finally:
-        conn.close()
+        release_connection(conn)
+
+
+@router.put("/update_devices")
+async def update_devices_bulk(items: List[DeviceInfoBulkItem]):
+    """Пакетное обновление уже зарегистрированных устройств"""
+    if not items:
+        raise HTTPException(status_code=400, detail="No devices to update")
+
+    try:
+        updated, existing = await asyncio.to_thread(_save_devices_bulk, items)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    from backend.api.simple.ws import broadcast_to_websockets
+
+    # Одно сообщение на всю пачку вместо N последовательных рассылок;
+    # id, которых нет в БД, клиентам не отправляем
+    devices = [
+        {
+            "device_id": item.device_id,
+            "device_info": item.model_dump(exclude_none=True, exclude={"device_id"}),
+        }
+        for item in items
+        if item.device_id in existing
+    ]
+    if devices:
+        await broadcast_to_websockets({"type": "devices_updated", "devices": devices})
+
+    print(f"Devices updated: {updated}/{len(items)}")
+    return {"status": "success", "updated": updated}
@@ -1,6 +1,8 @@
 import asyncio
+import os
 from typing import Any
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from backend.api.simple import state
@@ -8,18 +10,50 @@ from backend.api.simple import state
 
 router = APIRouter()
 
+# Keep-alive никогда не меняется: кодируем один раз при импорте
+KEEPALIVE_MESSAGE = orjson.dumps({"type": "keepalive"}).decode()
+
+# Потолок на одну отправку: зависший клиент не задерживает рассылку остальным
+WS_SEND_TIMEOUT_S = float(os.getenv("WS_SEND_TIMEOUT_S", "1.0"))
+
+
+async def _send(ws: WebSocket, message: str) -> None:
+    await asyncio.wait_for(ws.send_text(message), timeout=WS_SEND_TIMEOUT_S)
+
+
+async def _drop(ws: WebSocket) -> None:
+    """Убираем сокет из рассылки и закрываем: фронтенд переподключится."""
+    state.websocket_connections.discard(ws)
+    try:
+        await ws.close()
+    except Exception:
+        pass
+
 
 async def broadcast_to_websockets(data: dict) -> None:
     if state.websocket_connections:
-        # Skip logging for audio_level_updated and device_updated to reduce noise
-        if data.get("type") not in ["audio_level_updated", "device_updated"]:
+        # Skip logging for audio level and device update messages to reduce noise
+        if data.get("type") not in [
+            "audio_level_updated",
+            "device_updated",
+            "devices_updated",
+        ]:
             print(
                 f"Broadcasting: {data.get('type', 'unknown')} to {len(state.websocket_connections)} clients"
             )
-        await asyncio.gather(
-            *[ws.send_json(data) for ws in state.websocket_connections],
+        # Сериализуем один раз и шлём всем параллельно; упавшие сокеты убираем.
+        message = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        connections = list(state.websocket_connections)
+        results = await asyncio.gather(
+            *[_send(ws, message) for ws in connections],
             return_exceptions=True,
         )
+        failed = [
+            ws for ws, result in zip(connections, results)
+            if isinstance(result, Exception)
+        ]
+        if failed:
+            await asyncio.gather(*[_drop(ws) for ws in failed])
 
 
 @router.websocket("/ws")
@@ -39,7 +73,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
             except asyncio.TimeoutError:
                 # Отправляем keep-alive
                 try:
-                    await websocket.send_json({"type": "keepalive"})
+                    await websocket.send_text(KEEPALIVE_MESSAGE)
                 except:
                     break
     except WebSocketDisconnect:
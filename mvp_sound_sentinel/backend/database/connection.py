@@ -0,0 +1,83 @@
+"""
+Thread-local SQLite connections reused across requests.
+"""
+
+import sqlite3
+import threading
+from typing import List
+
+
+_local = threading.local()
+# Every connection opened by any thread, so shutdown can close them all.
+_all_connections: List[sqlite3.Connection] = []
+_all_lock = threading.Lock()
+# Bumped on shutdown; threads holding an older generation reconnect.
+_generation = 0
+
+# Per-connection page cache in KiB (negative = size, not pages).
+CACHE_SIZE_KIB = 65536
+# Reads through a shared memory map instead of read() syscalls.
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+# Prepared statements kept per connection, keyed by SQL text.
+CACHED_STATEMENTS = 128
+
+
+def open_database(db_path: str) -> sqlite3.Connection:
+    """Open a new connection with the project's PRAGMA set applied.
+
+    journal_mode=WAL is persisted in the file, so running this first on a
+    fresh path creates the database directly in WAL mode.
+    """
+    conn = sqlite3.connect(
+        db_path, check_same_thread=False, cached_statements=CACHED_STATEMENTS
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+    return conn
+
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """Return this thread's connection to `db_path`, opening it on first use.
+
+    Each thread (the event loop and every `asyncio.to_thread` worker) keeps
+    its own long-lived connection, so requests skip connect/close and keep a
+    warm page cache while WAL lets readers run alongside the writer.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None or _local.generation != _generation:
+        connections = _local.connections = {}
+        _local.generation = _generation
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = open_database(db_path)
+        conn.row_factory = sqlite3.Row
+        connections[db_path] = conn
+        with _all_lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def release_connection(conn: sqlite3.Connection) -> None:
+    """Hand a connection back: roll back anything left uncommitted."""
+    if conn.in_transaction:
+        conn.rollback()
+
+
+def close_all_connections() -> None:
+    """Close every pooled connection (called once at shutdown)."""
+    global _generation
+    with _all_lock:
+        connections = list(_all_connections)
+        _all_connections.clear()
+        _generation += 1
+    for conn in connections:
+        try:
+            # Lets SQLite re-ANALYZE tables whose queries would benefit
+            conn.execute("PRAGMA optimize")
+            conn.close()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,105 @@
+"""
+Background batching of sound_detections inserts.
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+from backend.database.connection import get_connection, release_connection
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_S = 0.05
+# Rows kept for retry while the database keeps failing; the oldest are
+# dropped beyond this so a persistent error can't grow the queue unbounded.
+MAX_PENDING_ROWS = 10000
+
+INSERT_DETECTION_SQL = """
+    INSERT INTO sound_detections
+    (id, device_id, sound_type, confidence, timestamp, embeddings)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+class DetectionWriter:
+    """Collects detection rows and writes them with one executemany per tick.
+
+    `submit` is called on the event loop and only appends; the flush runs in
+    a worker thread, so a request never waits for an INSERT + commit.
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL_S):
+        self.interval = interval
+        self.db_path: Optional[str] = None
+        self._pending: List[Tuple[Any, ...]] = []
+        self._task: Optional[asyncio.Task] = None
+        # One flush at a time: an awaited flush() returns only after every row
+        # queued before it is committed, even if the tick's flush was running.
+        self._lock = asyncio.Lock()
+        # The loop checks this between ticks instead of being cancelled: a
+        # cancel would release `_lock` while the worker thread is still
+        # inside executemany, and the final flush would race it.
+        self._stopping = asyncio.Event()
+
+    def start(self, db_path: str) -> None:
+        self.db_path = db_path
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still queued."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def submit(self, row: Tuple[Any, ...]) -> None:
+        self._pending.append(row)
+
+    async def flush(self) -> None:
+        """Write everything queued so far; failed rows stay queued for retry.
+
+        Deletes of detections await this first, so a batch still waiting for
+        its tick can't be written after the DELETE and bring rows back.
+        """
+        async with self._lock:
+            if not self._pending or self.db_path is None:
+                return
+            rows, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._write, self.db_path, rows)
+            except Exception:
+                self._pending[:0] = rows
+                dropped = len(self._pending) - MAX_PENDING_ROWS
+                if dropped > 0:
+                    del self._pending[:dropped]
+                logger.exception(
+                    "detection batch of %d rows failed: %d queued, %d dropped",
+                    len(rows),
+                    len(self._pending),
+                    max(dropped, 0),
+                )
+
+    @staticmethod
+    def _write(db_path: str, rows: List[Tuple[Any, ...]]) -> None:
+        conn = get_connection(db_path)
+        try:
+            conn.executemany(INSERT_DETECTION_SQL, rows)
+            conn.commit()
+        finally:
+            release_connection(conn)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+detection_writer = DetectionWriter()
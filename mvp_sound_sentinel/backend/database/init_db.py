@@ -1,11 +1,22 @@
-import sqlite3
+import logging
+import os
+
+from backend.database.connection import open_database
+from backend.database.schema import run_migrations
+
+
+logger = logging.getLogger(__name__)
 
 
 def init_database(db_path: str) -> None:
     """Create SQLite tables if they don't exist."""
-    conn = sqlite3.connect(db_path)
+    # WAL is persisted in the database file, so every later connection uses it.
+    conn = open_database(db_path)
     cursor = conn.cursor()
 
+    # The whole schema in one transaction: one commit instead of one per DDL
+    cursor.execute("BEGIN")
+
     # Table: devices
     cursor.execute(
         """
@@ -27,29 +38,17 @@ def init_database(db_path: str) -> None:
         """
     )
 
-    # Migration: Add new columns if they don't exist
-    try:
-        cursor.execute("ALTER TABLE devices ADD COLUMN cpu_usage REAL DEFAULT 0")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-
-    try:
-        cursor.execute(
-            "ALTER TABLE devices ADD COLUMN device_temperature REAL DEFAULT 0"
-        )
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-
     # Table: sound_detections
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS sound_detections (
-            id TEXT PRIMARY KEY,
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL,
             device_id TEXT NOT NULL,
             sound_type TEXT NOT NULL,
             confidence REAL NOT NULL,
             timestamp TEXT NOT NULL,
-            embeddings TEXT,
+            embeddings BLOB,
             FOREIGN KEY (device_id) REFERENCES devices (id)
         )
         """
@@ -60,13 +59,13 @@ def init_database(db_path: str) -> None:
         """
         CREATE TABLE IF NOT EXISTS custom_sounds (
             id TEXT PRIMARY KEY,
-            device_id TEXT NOT NULL,
             name TEXT NOT NULL,
-            sound_type TEXT NOT NULL CHECK (sound_type IN ('specific', 'excluded')),
-            embeddings TEXT,
-            centroid TEXT,
-            threshold REAL DEFAULT 0.75,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            sound_type TEXT NOT NULL,
+            embeddings BLOB,
+            centroid BLOB,
+            threshold REAL DEFAULT 0.8,
+            device_id TEXT,
+            created_at TEXT NOT NULL,
             FOREIGN KEY (device_id) REFERENCES devices (id)
         )
         """
@@ -100,6 +99,47 @@ def init_database(db_path: str) -> None:
         """
     )
 
+    # Indexes for per-device lookups ordered by time
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_detections_device_ts
+        ON sound_detections (device_id, timestamp DESC)
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_custom_sounds_device ON custom_sounds (device_id)"
+    )
+    # FK columns of the notification tables: their UNIQUE(sound_name, device_id)
+    # cannot serve lookups and deletes by device_id alone
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_notification_sounds_device "
+        "ON notification_sounds (device_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_excluded_sounds_device "
+        "ON excluded_sounds (device_id)"
+    )
+    # Device lookup by MAC on every registration
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_devices_mac ON devices (mac_address)"
+    )
+
+    # Pending schema migrations (PRAGMA user_version), same transaction
+    run_migrations(cursor)
+
+    # Sync legacy/default custom thresholds with environment default.
+    default_match_threshold = float(os.getenv("CUSTOM_MATCH_DEFAULT_THRESHOLD", "0.7"))
+    cursor.execute(
+        """
+        UPDATE custom_sounds
+        SET threshold = ?
+        WHERE threshold IS NULL OR ABS(threshold - 0.75) < 0.000001 OR ABS(threshold - 0.6) < 0.000001
+        """,
+        (default_match_threshold,),
+    )
+
     conn.commit()
+    # Refresh planner statistics (sqlite_stat1) for the new schema
+    conn.execute("PRAGMA optimize")
     conn.close()
-    print("✅ База данных инициализирована")
+    logger.info("database initialized: %s", db_path)
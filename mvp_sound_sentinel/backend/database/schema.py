@@ -0,0 +1,190 @@
+"""
+Schema evolution: declarative column lists and PRAGMA user_version migrations.
+"""
+
+import logging
+import sqlite3
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from backend.utils.embeddings import (
+    EMBEDDING_DIM,
+    embedding_to_blob,
+    embeddings_to_blob,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# SQLite-side "now" in the same local ISO-8601 shape as datetime.isoformat()
+# (millisecond precision), so text comparisons against Python timestamps hold.
+NOW_ISO_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+# (column, declaration) for every devices column added after the first schema
+DEVICE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("model", "TEXT DEFAULT 'Unknown'"),
+    ("model_image_url", "TEXT"),
+    ("microphone_info", "TEXT"),
+    ("wifi_signal", "INTEGER DEFAULT 0"),
+    ("cpu_usage", "REAL DEFAULT 0"),
+    ("device_temperature", "REAL DEFAULT 0"),
+)
+
+
+def add_missing_columns(
+    cursor: sqlite3.Cursor, table: str, columns: Sequence[Tuple[str, str]]
+) -> List[str]:
+    """ALTER in only the columns `table` lacks; returns their names.
+
+    The schema is read once with PRAGMA table_info, so re-running is a
+    no-op and no ALTER is attempted just to catch "duplicate column".
+    """
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for name, declaration in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+            added.append(name)
+    return added
+
+
+def _add_device_columns(cursor: sqlite3.Cursor) -> None:
+    added = add_missing_columns(cursor, "devices", DEVICE_COLUMNS)
+    if added:
+        logger.info("devices: added columns %s", ", ".join(added))
+
+
+def _detections_rowid_key(cursor: sqlite3.Cursor) -> None:
+    """Rebuild sound_detections around an INTEGER PRIMARY KEY (rowid alias).
+
+    The old `id TEXT PRIMARY KEY` kept a second B-tree over the text ids
+    that every insert had to update. Detection ids are generated by the
+    server (a per-process random prefix plus a hex counter, see
+    detect_sound.py), unique by construction and never looked up by id, so
+    they stay as a plain column.
+    """
+    columns = cursor.execute("PRAGMA table_info(sound_detections)").fetchall()
+    if any(row[1] == "seq" for row in columns):
+        return
+    cursor.execute(
+        """
+        CREATE TABLE sound_detections_new (
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL,
+            device_id TEXT NOT NULL,
+            sound_type TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            embeddings BLOB,
+            FOREIGN KEY (device_id) REFERENCES devices (id)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO sound_detections_new
+            (id, device_id, sound_type, confidence, timestamp, embeddings)
+        SELECT id, device_id, sound_type, confidence, timestamp, embeddings
+        FROM sound_detections
+        ORDER BY timestamp
+        """
+    )
+    cursor.execute("DROP TABLE sound_detections")
+    cursor.execute("ALTER TABLE sound_detections_new RENAME TO sound_detections")
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_detections_device_ts
+        ON sound_detections (device_id, timestamp DESC)
+        """
+    )
+    logger.info("sound_detections: rebuilt with INTEGER PRIMARY KEY")
+
+
+def _legacy_embeddings_to_blob(cursor: sqlite3.Cursor) -> None:
+    """Rewrite JSON-text vectors left from before the BLOB columns.
+
+    Readers still accept JSON, so a row that doesn't decode to the expected
+    shape is left as it is rather than failing the migration.
+    """
+    def _vector(text: str) -> Optional[List[float]]:
+        try:
+            value = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return None
+        if isinstance(value, list) and len(value) == EMBEDDING_DIM:
+            return value
+        return None
+
+    detections = []
+    for rowid, text in cursor.execute(
+        "SELECT rowid, embeddings FROM sound_detections "
+        "WHERE typeof(embeddings) = 'text'"
+    ).fetchall():
+        vector = _vector(text)
+        if vector is not None:
+            detections.append((embedding_to_blob(vector), rowid))
+    cursor.executemany(
+        "UPDATE sound_detections SET embeddings = ? WHERE rowid = ?", detections
+    )
+
+    sounds = 0
+    for rowid, embeddings_text, centroid_text in cursor.execute(
+        "SELECT rowid, embeddings, centroid FROM custom_sounds "
+        "WHERE typeof(embeddings) = 'text' OR typeof(centroid) = 'text'"
+    ).fetchall():
+        embeddings = embeddings_text
+        if isinstance(embeddings_text, str):
+            try:
+                rows = orjson.loads(embeddings_text)
+                stacked = [rows] if rows and not isinstance(rows[0], list) else rows
+                if stacked and all(len(row) == EMBEDDING_DIM for row in stacked):
+                    embeddings = embeddings_to_blob(stacked)
+            except (ValueError, TypeError, KeyError):
+                pass
+        centroid = centroid_text
+        if isinstance(centroid_text, str):
+            vector = _vector(centroid_text)
+            if vector is not None:
+                centroid = embedding_to_blob(vector)
+        if embeddings is not embeddings_text or centroid is not centroid_text:
+            cursor.execute(
+                "UPDATE custom_sounds SET embeddings = ?, centroid = ? WHERE rowid = ?",
+                (embeddings, centroid, rowid),
+            )
+            sounds += 1
+
+    if detections or sounds:
+        logger.info(
+            "embeddings: converted %d detections and %d custom sounds to BLOB",
+            len(detections),
+            sounds,
+        )
+
+
+# (version, step) in ascending order. A step runs once, when the database's
+# user_version is below its version; steps must tolerate a schema that
+# CREATE TABLE already made current (fresh databases run them too).
+MIGRATIONS: Tuple[Tuple[int, Callable[[sqlite3.Cursor], None]], ...] = (
+    (1, _add_device_columns),
+    (2, _detections_rowid_key),
+    (3, _legacy_embeddings_to_blob),
+)
+
+
+def run_migrations(cursor: sqlite3.Cursor) -> int:
+    """Apply pending MIGRATIONS and bump user_version; returns the version.
+
+    Runs inside the caller's transaction, so the steps and the version bump
+    commit (or roll back) together.
+    """
+    current = cursor.execute("PRAGMA user_version").fetchone()[0]
+    version = current
+    for target, step in MIGRATIONS:
+        if target > version:
+            step(cursor)
+            version = target
+    if version != current:
+        cursor.execute(f"PRAGMA user_version = {version}")
+        logger.info("schema migrated: user_version %d -> %d", current, version)
+    return version
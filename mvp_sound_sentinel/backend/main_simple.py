@@ -4,24 +4,32 @@ Sound Sentinel MVP - API Server (Simple Version)
 Простой сервер с захардкоденным SSL
 """
 
+import logging
 import os
 import sys
-import json
 import uuid
-import sqlite3
 import asyncio
 import warnings
 from datetime import datetime
 from contextlib import asynccontextmanager
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 # Подавление TensorFlow предупреждений
 import tensorflow as tf
 import tensorflow_hub as hub
 import numpy as np
-
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request
+import orjson
+
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 import time
@@ -41,16 +49,35 @@ except Exception:
 
 from backend.api.simple import state as simple_state
 from backend.api.simple.router import router as simple_router
+from backend.api.simple.ws import broadcast_to_websockets
+from backend.database.connection import (
+    close_all_connections,
+    get_connection,
+    release_connection,
+)
+from backend.database.detection_writer import detection_writer
+from backend.database.init_db import init_database
+from backend.utils.embeddings import embedding_from_db
+from backend.utils.inference_pool import shutdown_inference_pool
 from backend.utils.yamnet_cached import (
     load_yamnet_model,
     get_cache_info,
     clear_yamnet_cache,
 )
 
+# Миграции и инициализация схемы пишут через logging (backend.database.*):
+# свой обработчик, чтобы INFO был виден и под uvicorn, не трогая root logger
+_db_logger = logging.getLogger("backend.database")
+if not _db_logger.handlers:
+    _db_handler = logging.StreamHandler()
+    _db_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s: %(message)s"))
+    _db_logger.addHandler(_db_handler)
+    _db_logger.setLevel(logging.INFO)
+
 # Глобальные переменные
 db_path = os.getenv("DB_PATH", "soundsentinel.db")
 model = None
-class_names = []
+class_names = ()
 websocket_connections = set()
 
 # Keep shared state in sync with extracted route modules.
@@ -71,6 +98,14 @@ USE_SSL = os.getenv("USE_SSL", "true").strip().lower() in {
 }
 SSL_CERT_PATH = os.getenv("SSL_CERT_PATH", "certs/cert.pem")
 SSL_KEY_PATH = os.getenv("SSL_KEY_PATH", "certs/key.pem")
+# Автоперезагрузка только для разработки: в проде модель грузится один раз
+RELOAD = os.getenv("RELOAD", "false").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "y",
+    "on",
+}
 
 
 # Модели данных
@@ -117,7 +152,7 @@ class DeviceUpdate(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("--- Server starting up ---")
-    init_database()
+    init_database(db_path)
     success = load_model()
     if not success:
         print("⚠️ Модель не загружена. Сервер будет работать в ограниченном режиме.")
@@ -128,13 +163,23 @@ async def lifespan(app: FastAPI):
     simple_state.class_names = class_names
     simple_state.websocket_connections = websocket_connections
 
+    detection_writer.start(db_path)
+
     yield
 
     print("--- Server shutting down ---")
+    await detection_writer.stop()
+    shutdown_inference_pool()
+    close_all_connections()
 
 
 # Инициализация FastAPI
-app = FastAPI(title="Sound Sentinel MVP", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="Sound Sentinel MVP",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS
 app.add_middleware(
@@ -177,101 +222,6 @@ async def log_requests(request: Request, call_next):
     return response
 
 
-# Инициализация базы данных
-def init_database():
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS devices (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            ip_address TEXT NOT NULL,
-            mac_address TEXT NOT NULL,
-            model TEXT DEFAULT 'Unknown',
-            model_image_url TEXT,
-            microphone_info TEXT,
-            wifi_signal INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'offline',
-            last_seen TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """
-    )
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sound_detections (
-            id TEXT PRIMARY KEY,
-            device_id TEXT NOT NULL,
-            sound_type TEXT NOT NULL,
-            confidence REAL NOT NULL,
-            timestamp TEXT NOT NULL,
-            embeddings TEXT,
-            FOREIGN KEY (device_id) REFERENCES devices (id)
-        )
-    """
-    )
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS custom_sounds (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            sound_type TEXT NOT NULL,
-            embeddings TEXT,
-            centroid TEXT,
-            threshold REAL DEFAULT 0.8,
-            device_id TEXT,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (device_id) REFERENCES devices (id)
-        )
-    """
-    )
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS notification_sounds (
-            id TEXT PRIMARY KEY,
-            sound_name TEXT NOT NULL,
-            device_id TEXT NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (device_id) REFERENCES devices (id),
-            UNIQUE(sound_name, device_id)
-        )
-    """
-    )
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS excluded_sounds (
-            id TEXT PRIMARY KEY,
-            sound_name TEXT NOT NULL,
-            device_id TEXT NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (device_id) REFERENCES devices (id),
-            UNIQUE(sound_name, device_id)
-        )
-    """
-    )
-
-    # Sync legacy/default custom thresholds with environment default.
-    default_match_threshold = float(os.getenv("CUSTOM_MATCH_DEFAULT_THRESHOLD", "0.7"))
-    cursor.execute(
-        """
-        UPDATE custom_sounds
-        SET threshold = ?
-        WHERE threshold IS NULL OR ABS(threshold - 0.75) < 0.000001 OR ABS(threshold - 0.6) < 0.000001
-        """,
-        (default_match_threshold,),
-    )
-
-    conn.commit()
-    conn.close()
-    print("Database initialized")
-
-
 # Загрузка модели с кэшированием
 def load_model():
     global model, class_names
@@ -296,65 +246,132 @@ def load_model():
 @app.post("/update_audio_level")
 async def update_audio_level(data: AudioLevel):
     """Обновление только уровня звука без детекции"""
-    dead_connections = []
-    for ws in list(websocket_connections):
-        try:
-            await ws.send_text(
-                json.dumps(
-                    {
-                        "type": "audio_level_updated",
-                        "device_id": data.device_id,
-                        "db_level": data.db_level,
-                        "timestamp": data.timestamp,
-                    }
-                )
-            )
-        except Exception:
-            dead_connections.append(ws)
-
-    for ws in dead_connections:
-        websocket_connections.discard(ws)
+    await broadcast_to_websockets(
+        {
+            "type": "audio_level_updated",
+            "device_id": data.device_id,
+            "db_level": data.db_level,
+            "timestamp": data.timestamp,
+        }
+    )
     return {"status": "success"}
 
 
-@app.get("/detections/{device_id}")
-async def get_detections(device_id: str, limit: int = 1000):
-    """Получение детекций для устройства"""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+# Детекции отдаются потоком пачками по DETECTIONS_BATCH строк: в памяти
+# одновременно только одна пачка, а не весь список до `limit`.
+DETECTIONS_BATCH = 256
 
-    # Сначала получаем общее количество
-    cursor.execute(
-        "SELECT COUNT(*) FROM sound_detections WHERE device_id = ?", (device_id,)
-    )
-    total_count = cursor.fetchone()[0]
-
-    # Затем получаем детекции с лимитом
-    cursor.execute(
-        """
-        SELECT id, sound_type, confidence, timestamp, embeddings
-        FROM sound_detections
-        WHERE device_id = ?
-        ORDER BY timestamp DESC
-        LIMIT ?
-    """,
-        (device_id, limit),
-    )
+_SELECT_DETECTIONS_SQL = """
+    SELECT id, sound_type, confidence, timestamp, embeddings, seq
+    FROM sound_detections
+    WHERE device_id = ?
+    ORDER BY timestamp DESC, seq DESC
+    LIMIT ?
+"""
+
+# Keyset-пагинация: следующая пачка начинается строго после последней строки
+# предыдущей, без OFFSET и без сдвига при новых вставках.
+_SELECT_DETECTIONS_AFTER_SQL = """
+    SELECT id, sound_type, confidence, timestamp, embeddings, seq
+    FROM sound_detections
+    WHERE device_id = ? AND (timestamp < ? OR (timestamp = ? AND seq < ?))
+    ORDER BY timestamp DESC, seq DESC
+    LIMIT ?
+"""
+
+
+def _count_detections(device_id: str) -> int:
+    conn = get_connection(db_path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM sound_detections WHERE device_id = ?", (device_id,)
+        ).fetchone()[0]
+    finally:
+        release_connection(conn)
+
+
+def _detections_chunk(
+    device_id: str, size: int, after: Optional[Tuple[str, int]]
+) -> Tuple[bytes, int, Optional[Tuple[str, int]]]:
+    """Одна пачка детекций, уже закодированная в JSON (элементы через запятую).
 
-    detections = []
-    for row in cursor.fetchall():
-        detections.append(
+    Возвращает (json, число строк, ключ последней строки для следующей пачки).
+    """
+    conn = get_connection(db_path)
+    try:
+        if after is None:
+            rows = conn.execute(_SELECT_DETECTIONS_SQL, (device_id, size)).fetchall()
+        else:
+            timestamp, seq = after
+            rows = conn.execute(
+                _SELECT_DETECTIONS_AFTER_SQL,
+                (device_id, timestamp, timestamp, seq, size),
+            ).fetchall()
+    finally:
+        release_connection(conn)
+
+    if not rows:
+        return b"", 0, None
+    chunk = b",".join(
+        orjson.dumps(
             {
                 "id": row[0],
                 "sound_type": row[1],
                 "confidence": row[2],
                 "timestamp": row[3],
-                "embeddings": json.loads(row[4]) if row[4] else [],
+                "embeddings": embedding_from_db(row[4]),
             }
         )
+        for row in rows
+    )
+    return chunk, len(rows), (rows[-1][3], rows[-1][5])
+
+
+async def _stream_detections(
+    device_id: str,
+    limit: int,
+    total_count: int,
+    first_batch: Tuple[bytes, int, Optional[Tuple[str, int]]],
+):
+    chunk, count, after = first_batch
+    yield b'{"detections":[' + chunk
+    size = min(DETECTIONS_BATCH, limit)
+    remaining = limit - count
+    error = b""
+    try:
+        while count == size and remaining > 0:
+            size = min(DETECTIONS_BATCH, remaining)
+            chunk, count, after = await asyncio.to_thread(
+                _detections_chunk, device_id, size, after
+            )
+            if count:
+                yield b"," + chunk
+            remaining -= count
+    except Exception as e:
+        # Статус 200 уже отправлен: закрываем JSON корректно и сообщаем об
+        # ошибке в теле, а не обрываем ответ на середине
+        print(f"❌ Error streaming detections for {device_id}: {e}")
+        error = b',"error":' + orjson.dumps(str(e))
+    yield b'],"total_count":' + str(total_count).encode() + error + b"}"
+
+
+@app.get("/detections/{device_id}")
+async def get_detections(device_id: str, limit: int = Query(default=1000, ge=0)):
+    """Получение детекций для устройства"""
+    # Счётчик и первая пачка читаются до ответа: их ошибка остаётся 500
+    try:
+        total_count = await asyncio.to_thread(_count_detections, device_id)
+        first_batch = await asyncio.to_thread(
+            _detections_chunk, device_id, min(DETECTIONS_BATCH, limit), None
+        )
+    except Exception as e:
+        print(f"❌ Error getting detections: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-    conn.close()
-    return {"detections": detections, "total_count": total_count}
+    return StreamingResponse(
+        _stream_detections(device_id, limit, total_count, first_batch),
+        media_type="application/json",
+    )
 
 
 # WebSocket функции
@@ -383,17 +400,18 @@ if __name__ == "__main__":
         print(f"cert_path: {cert_path}")
         print(f"key_path: {key_path}")
     else:
-        import logging
-
         # Completely disable Uvicorn access logging
         logging.getLogger("uvicorn.access").handlers = []
         logging.getLogger("uvicorn.access").propagate = False
 
+        # Один процесс: кэши custom sounds / centroid / настроек уведомлений
+        # и WebSocket-клиенты живут в памяти процесса и сбрасываются только в
+        # нём, поэтому несколько uvicorn workers разошлись бы по состоянию.
         uvicorn.run(
             "main_simple:app",
             host=HOST,
             port=PORT,
-            reload=True,
+            reload=RELOAD,
             log_level="info",
             ssl_keyfile=key_path,
             ssl_certfile=cert_path,
@@ -0,0 +1,37 @@
+import base64
+
+import numpy as np
+
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+WINDOW_SAMPLES = 15300  # 0.96s * 16kHz: одно окно YAMNet
+
+
+def decode_pcm(raw: bytes, dtype: str = "float32") -> np.ndarray:
+    """Decode little-endian PCM bytes (int16 or float32) into float32 samples."""
+    if dtype == "int16":
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32)
+        samples *= _INT16_SCALE
+        return samples
+    return np.frombuffer(raw, dtype="<f4").astype(np.float32, copy=False)
+
+
+def decode_pcm_base64(payload: str, dtype: str = "float32") -> np.ndarray:
+    """Decode base64 little-endian PCM (int16 or float32) into float32 samples."""
+    return decode_pcm(base64.b64decode(payload), dtype)
+
+
+def prepare_window(audio: np.ndarray, length: int = WINDOW_SAMPLES) -> np.ndarray:
+    """Contiguous mono float32 window of exactly `length` samples.
+
+    Multi-channel input keeps the first channel; short input is zero-padded
+    into one preallocated buffer, long input is truncated.
+    """
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    if audio.shape[0] >= length:
+        return np.ascontiguousarray(audio[:length], dtype=np.float32)
+    window = np.zeros(length, dtype=np.float32)
+    window[: audio.shape[0]] = audio
+    return window
@@ -1,118 +1,171 @@
-import json
-import sqlite3
-from typing import Dict, List, Any
+import os
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 
 import numpy as np
 
-from backend.utils.similarity import cosine_similarity
+from backend.database.connection import get_connection, release_connection
+from backend.utils.device_cache import DeviceCache
+from backend.utils.embeddings import (
+    EMBEDDING_DIM,
+    embedding_from_db,
+    embeddings_from_db,
+)
+from backend.utils import similarity
+from backend.utils.similarity import (
+    cosine_similarities,
+    cosine_similarities_int8,
+    quantize_int8,
+)
+
+
+# Runs on every detection: one constant string, so the pooled connection's
+# sqlite3 statement cache hands back the same prepared statement each time.
+SELECT_CUSTOM_SOUNDS_SQL = """
+    SELECT id, name, sound_type, embeddings, centroid, threshold
+    FROM custom_sounds
+    WHERE device_id = ?
+"""
+
+def _parse_centroid(
+    name: str, embeddings_raw: Any, centroid_raw: Any
+) -> Optional[List[float]]:
+    """Parse stored centroid (or derive it from embeddings).
+
+    New rows hold BLOBs (float32 centroid, float16 embeddings); legacy rows
+    hold JSON text.
+    """
+    if centroid_raw:
+        centroid = embedding_from_db(centroid_raw)
+
+        if isinstance(centroid, (int, float)):
+            # If centroid is a scalar, fall back to embeddings.
+            print(f"⚠️ Centroid это число ({centroid}), используем embeddings")
+            embeddings = embeddings_from_db(embeddings_raw)
+            if not embeddings:
+                print(f"❌ Нет embeddings для звука {name}")
+                return None
+            if isinstance(embeddings[0], list):
+                return np.mean(embeddings, axis=0).tolist()
+            return embeddings
+
+        return centroid
+
+    embeddings = embeddings_from_db(embeddings_raw)
+    if not embeddings:
+        print(f"❌ Нет embeddings для звука {name}")
+        return None
+    return np.mean(embeddings, axis=0).tolist()
+
+
+class _DeviceCentroids(NamedTuple):
+    # (id, name, sound_type, threshold) per row of `matrix`
+    sounds: List[Tuple[Any, str, str, Any]]
+    # (N, EMBEDDING_DIM) float32, rows L2-normalized
+    matrix: np.ndarray
+    # Same rows quantized to int8 when CUSTOM_MATCH_INT8 is on
+    matrix_i8: Optional[np.ndarray] = None
+
+
+# Optional: compare int8-quantized centroids with simsimd's i8 cosine kernel
+# (4x fewer bytes per centroid; needs simsimd, otherwise float32 is used).
+CUSTOM_MATCH_INT8 = os.getenv("CUSTOM_MATCH_INT8", "0") == "1"
+
+
+def invalidate_custom_centroids(device_id: Optional[str] = None) -> None:
+    """Drop cached centroids (for one device or for all)."""
+    _centroid_cache.invalidate(device_id)
+
+
+def _load_device_centroids(db_path: str, device_id: str) -> _DeviceCentroids:
+    conn = get_connection(db_path)
+    try:
+        custom_sounds = conn.execute(
+            SELECT_CUSTOM_SOUNDS_SQL, (device_id,)
+        ).fetchall()
+    finally:
+        release_connection(conn)
+
+    sounds = []
+    centroids = []
+    for sound in custom_sounds:
+        sound_id, name, sound_type, embeddings_raw, centroid_raw, threshold = sound
+
+        try:
+            centroid = _parse_centroid(name, embeddings_raw, centroid_raw)
+        except Exception as e:
+            print(f"❌ Ошибка парсинга centroid для {name}: {e}")
+            continue
+
+        if not isinstance(centroid, list) or len(centroid) != EMBEDDING_DIM:
+            print(f"❌ Некорректный centroid для {name}")
+            continue
+
+        sounds.append((sound_id, name, sound_type, threshold))
+        centroids.append(centroid)
+
+    matrix = np.asarray(centroids, dtype=np.float32).reshape(-1, EMBEDDING_DIM)
+    # Новые centroid уже единичные (нормируются при обучении); старые строки
+    # нормируем здесь. Нулевой centroid ни на что не похож: отбрасываем.
+    norms = np.linalg.norm(matrix, axis=1)
+    valid = np.flatnonzero(norms > 0)
+    matrix = np.ascontiguousarray(matrix[valid] / norms[valid, None])
+    matrix_i8 = None
+    if CUSTOM_MATCH_INT8 and similarity.simsimd is not None and valid.size:
+        matrix_i8 = quantize_int8(matrix)
+    return _DeviceCentroids([sounds[i] for i in valid], matrix, matrix_i8)
+
+
+# Per-device centroid matrices; rebuilt only after custom sounds change.
+_centroid_cache: DeviceCache[_DeviceCentroids] = DeviceCache(_load_device_centroids)
 
 
 def find_best_custom_match(
     embedding: List[float], device_id: str, db_path: str
 ) -> Dict[str, Any]:
-    """Find best matching custom sound centroid using cosine similarity."""
+    """Find best matching custom sound centroid using cosine similarity.
+
+    The device's centroids are parsed, stacked and L2-normalized once and
+    cached, so a detection costs one matrix-vector product (simsimd if
+    installed, otherwise a numpy matmul) with no SQLite or BLOB decoding.
+    """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT id, name, sound_type, embeddings, centroid, threshold 
-            FROM custom_sounds 
-            WHERE device_id = ?
-            """,
-            (device_id,),
+        query = np.asarray(embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if query.size != EMBEDDING_DIM or query_norm == 0.0:
+            return {}
+
+        centroids = _centroid_cache.get(db_path, device_id)
+        if not centroids.sounds:
+            return {}
+
+        if centroids.matrix_i8 is not None:
+            similarities = cosine_similarities_int8(centroids.matrix_i8, query)
+        else:
+            similarities = cosine_similarities(
+                centroids.matrix, query, rows_normalized=True
+            )
+        best = int(np.argmax(similarities))
+        best_similarity = float(similarities[best])
+        if best_similarity <= 0.0:
+            return {}
+
+        sound_id, name, sound_type, threshold = centroids.sounds[best]
+        default_threshold = float(os.getenv("CUSTOM_MATCH_DEFAULT_THRESHOLD", "0.7"))
+        stored_threshold = (
+            float(threshold) if threshold is not None else default_threshold
         )
+        effective_threshold = max(stored_threshold, default_threshold)
 
-        custom_sounds = cursor.fetchall()
-        conn.close()
-
-        best_match = None
-        best_similarity = 0.0
-
-        for sound in custom_sounds:
-            sound_id, name, sound_type, embeddings_str, centroid_str, threshold = sound
-
-            print(f"🔍 Проверяем custom sound: {name} (type: {sound_type})")
-
-            # Parse centroid (if stored) or derive it from embeddings
-            try:
-                if centroid_str:
-                    centroid = json.loads(centroid_str)
-
-                    # Convert numpy-like structures into Python list
-                    if hasattr(centroid, "tolist"):
-                        centroid = centroid.tolist()
-                    elif isinstance(centroid, np.ndarray):
-                        centroid = centroid.tolist()
-                    elif isinstance(centroid, (int, float)):
-                        # If centroid is a scalar, fall back to embeddings.
-                        print(
-                            f"⚠️ Centroid это число ({centroid}), используем embeddings"
-                        )
-                        embeddings = (
-                            json.loads(embeddings_str) if embeddings_str else []
-                        )
-                        if embeddings and len(embeddings) > 0:
-                            if isinstance(embeddings[0], list):
-                                centroid = np.mean(embeddings, axis=0).tolist()
-                            else:
-                                centroid = embeddings
-                        else:
-                            print(f"❌ Нет embeddings для звука {name}")
-                            continue
-
-                    print(
-                        f"✅ Centroid загружен: {len(centroid) if isinstance(centroid, list) else 'not array'}"
-                    )
-                else:
-                    embeddings = json.loads(embeddings_str) if embeddings_str else []
-                    if embeddings:
-                        centroid = np.mean(embeddings, axis=0).tolist()
-                        print(f"✅ Centroid вычислен: {len(centroid)} элементов")
-                    else:
-                        print(f"❌ Нет embeddings для звука {name}")
-                        continue
-            except Exception as e:
-                print(f"❌ Ошибка парсинга centroid для {name}: {e}")
-                continue
-
-            if not isinstance(centroid, list):
-                print(f"❌ Centroid не является списком для {name}: {type(centroid)}")
-                continue
-
-            try:
-                similarity = cosine_similarity(embedding, centroid)
-                print(f"📊 Схожесть с {name}: {similarity:.3f}")
-            except Exception as e:
-                print(f"❌ Ошибка вычисления схожести с {name}: {e}")
-                continue
-
-            if similarity > best_similarity:
-                best_similarity = similarity
-                import os
-
-                default_threshold = float(
-                    os.getenv("CUSTOM_MATCH_DEFAULT_THRESHOLD", "0.7")
-                )
-
-                stored_threshold = (
-                    float(threshold) if threshold is not None else default_threshold
-                )
-                effective_threshold = max(stored_threshold, default_threshold)
-
-                best_match = {
-                    "id": sound_id,
-                    "name": name,
-                    "sound_type": sound_type,
-                    "similarity": similarity,
-                    "threshold": effective_threshold,
-                }
-                print(
-                    f" Новый лучший матч: {name} (схожесть: {similarity:.3f}) (threshold: {effective_threshold:.3f})"
-                )
-
-        return best_match or {}
+        print(
+            f" Лучший матч: {name} (схожесть: {best_similarity:.3f}) (threshold: {effective_threshold:.3f})"
+        )
+        return {
+            "id": sound_id,
+            "name": name,
+            "sound_type": sound_type,
+            "similarity": best_similarity,
+            "threshold": effective_threshold,
+        }
     except Exception as e:
         print(f" Ошибка поиска custom match: {e}")
         return {}
@@ -0,0 +1,42 @@
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class DeviceCache(Generic[T]):
+    """Per-device snapshots, reloaded only after `invalidate`.
+
+    Misses are filled under a lock, so concurrent lookups for one device
+    (detections run in several to_thread workers) load it once. A
+    generation counter keeps a load that an invalidation raced past from
+    being published.
+    """
+
+    def __init__(self, load: Callable[[str, str], T]):
+        self._load = load
+        self._entries: Dict[str, T] = {}
+        self._generation = 0
+        self._fill_lock = threading.Lock()
+
+    def invalidate(self, device_id: Optional[str] = None) -> None:
+        """Drop the snapshot for one device, or for all of them."""
+        self._generation += 1
+        if device_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(device_id, None)
+
+    def get(self, db_path: str, device_id: str) -> T:
+        value = self._entries.get(device_id)
+        if value is not None:
+            return value
+        with self._fill_lock:
+            value = self._entries.get(device_id)
+            if value is None:
+                generation = self._generation
+                value = self._load(db_path, device_id)
+                if generation == self._generation:
+                    self._entries[device_id] = value
+        return value
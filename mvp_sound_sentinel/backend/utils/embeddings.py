@@ -0,0 +1,51 @@
+"""
+(De)serialization of embedding vectors stored in SQLite.
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+import orjson
+
+
+# Размерность эмбеддинга YAMNet
+EMBEDDING_DIM = 1024
+
+
+def embedding_to_blob(embedding: Any) -> Optional[bytes]:
+    """float32 little-endian bytes; None for a missing/empty vector."""
+    if embedding is None:
+        return None
+    arr = np.asarray(embedding, dtype="<f4")
+    return arr.tobytes() if arr.size else None
+
+
+def embedding_from_db(value: Any) -> List[float]:
+    """Decode a BLOB column, falling back to legacy JSON/str text rows."""
+    if not value:
+        return []
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype="<f4").tolist()
+    return orjson.loads(value)
+
+
+def embeddings_to_blob(embeddings: Any) -> Optional[bytes]:
+    """Stack of training embeddings as float16 bytes (half of float32).
+
+    Only the centroid takes part in matching, so the per-recording vectors
+    are kept at reduced precision.
+    """
+    if embeddings is None:
+        return None
+    arr = np.asarray(embeddings, dtype="<f2")
+    return arr.tobytes() if arr.size else None
+
+
+def embeddings_from_db(value: Any, dim: int = EMBEDDING_DIM) -> List[Any]:
+    """Decode a float16 BLOB into rows of `dim` floats; legacy JSON as is."""
+    if not value:
+        return []
+    if isinstance(value, (bytes, memoryview)):
+        arr = np.frombuffer(value, dtype="<f2").reshape(-1, dim)
+        return arr.astype(np.float32).tolist()
+    return orjson.loads(value)
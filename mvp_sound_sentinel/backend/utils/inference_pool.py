@@ -0,0 +1,39 @@
+"""
+Dedicated thread pool for YAMNet inference.
+
+Keeping inference off asyncio's default executor means the short SQLite
+calls made via asyncio.to_thread never queue behind model runs.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+_CPU_COUNT = os.cpu_count() or 1
+
+# A few concurrent model calls, each with its share of cores for TF's
+# intra-op pool, instead of every worker fanning out over every core.
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(max(2, _CPU_COUNT // 2))))
+INTRA_OP_THREADS = int(
+    os.getenv("TF_INTRA_OP_THREADS", str(max(1, _CPU_COUNT // INFERENCE_WORKERS)))
+)
+INTER_OP_THREADS = int(os.getenv("TF_INTER_OP_THREADS", "1"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=INFERENCE_WORKERS, thread_name_prefix="yamnet"
+)
+
+
+async def run_inference(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking model call on the inference pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args))
+
+
+def shutdown_inference_pool() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
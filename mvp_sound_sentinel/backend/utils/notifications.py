@@ -1,49 +1,86 @@
-import sqlite3
+from typing import Dict, FrozenSet, NamedTuple, Optional
+
+from backend.database.connection import get_connection, release_connection
+from backend.utils.device_cache import DeviceCache
+
+
+class _DeviceSoundSettings(NamedTuple):
+    excluded: FrozenSet[str]
+    important: FrozenSet[str]
+    custom_types: Dict[str, str]
+    # sound_type -> decision; lives and dies with this snapshot.
+    decisions: Dict[str, bool]
+
+
+# All three per-device lists in one round trip: (source, name, sound_type).
+# Each branch is served by its table's device_id index.
+SELECT_DEVICE_SETTINGS_SQL = """
+    SELECT 'excluded', sound_name, NULL FROM excluded_sounds WHERE device_id = ?
+    UNION ALL
+    SELECT 'important', sound_name, NULL FROM notification_sounds WHERE device_id = ?
+    UNION ALL
+    SELECT 'custom', name, sound_type FROM custom_sounds WHERE device_id = ?
+"""
+
+def invalidate_notification_settings(device_id: Optional[str] = None) -> None:
+    """Drop cached notification settings (for one device or for all)."""
+    _settings_cache.invalidate(device_id)
+
+
+def _load_device_settings(db_path: str, device_id: str) -> _DeviceSoundSettings:
+    conn = get_connection(db_path)
+    try:
+        rows = conn.execute(
+            SELECT_DEVICE_SETTINGS_SQL, (device_id, device_id, device_id)
+        ).fetchall()
+    finally:
+        release_connection(conn)
+
+    excluded = set()
+    important = set()
+    custom_types: Dict[str, str] = {}
+    for source, name, sound_type in rows:
+        if source == "excluded":
+            excluded.add(name.lower())
+        elif source == "important":
+            important.add(name.lower())
+        else:
+            custom_types.setdefault(name.lower(), sound_type)
+
+    return _DeviceSoundSettings(
+        frozenset(excluded), frozenset(important), custom_types, {}
+    )
+
+
+# Per-device lowercased name sets; rebuilt only after settings change.
+_settings_cache: DeviceCache[_DeviceSoundSettings] = DeviceCache(
+    _load_device_settings
+)
 
 
 def should_send_notification(db_path: str, device_id: str, sound_type: str) -> bool:
     """Check if notifications should be sent for given sound/class."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    settings = _settings_cache.get(db_path, device_id)
+    decision = settings.decisions.get(sound_type)
+    if decision is None:
+        decision = settings.decisions[sound_type] = _decide(settings, sound_type)
+    return decision
+
+
+def _decide(settings: _DeviceSoundSettings, sound_type: str) -> bool:
+    name = sound_type.lower()
 
     # Check excluded sounds
-    cursor.execute(
-        """
-        SELECT COUNT(*) FROM excluded_sounds 
-        WHERE device_id = ? AND LOWER(sound_name) = LOWER(?)
-        """,
-        (device_id, sound_type),
-    )
-    if cursor.fetchone()[0] > 0:
-        conn.close()
+    if name in settings.excluded:
         return False
 
     # Check important notification sounds
-    cursor.execute(
-        """
-        SELECT COUNT(*) FROM notification_sounds 
-        WHERE device_id = ? AND LOWER(sound_name) = LOWER(?)
-        """,
-        (device_id, sound_type),
-    )
-    if cursor.fetchone()[0] > 0:
-        conn.close()
+    if name in settings.important:
         return True
 
     # Check custom sounds (legacy logic)
-    cursor.execute(
-        """
-        SELECT sound_type FROM custom_sounds 
-        WHERE device_id = ? AND LOWER(name) = LOWER(?)
-        """,
-        (device_id, sound_type),
-    )
-
-    custom_sound = cursor.fetchone()
-    conn.close()
-
-    if custom_sound:
-        return custom_sound[0] == "notification"
+    custom_sound_type = settings.custom_types.get(name)
+    if custom_sound_type is not None:
+        return custom_sound_type == "notification"
 
     return False
-
@@ -2,22 +2,66 @@ from typing import List
 
 import numpy as np
 
+try:
+    # Optional: SIMD kernels (AVX2/AVX-512/NEON) straight on the float32 buffers
+    import simsimd
+except ImportError:
+    simsimd = None
+
 
 def cosine_similarity(a: List[float], b: List[float]) -> float:
     """Cosine similarity between two embedding vectors."""
     try:
-        a_np = np.array(a)
-        b_np = np.array(b)
+        a_np = np.ascontiguousarray(a, dtype=np.float32)
+        b_np = np.ascontiguousarray(b, dtype=np.float32)
 
-        dot_product = np.dot(a_np, b_np)
         norm_a = np.linalg.norm(a_np)
         norm_b = np.linalg.norm(b_np)
 
         if norm_a == 0 or norm_b == 0:
             return 0.0
 
-        return float(dot_product / (norm_a * norm_b))
+        if simsimd is not None:
+            return 1.0 - float(simsimd.cosine(a_np, b_np))
+
+        return float(np.dot(a_np, b_np) / (norm_a * norm_b))
     except Exception as e:
         print(f"❌ Ошибка вычисления cosine similarity: {e}")
         return 0.0
 
+
+def cosine_similarities(
+    matrix: np.ndarray, query: np.ndarray, rows_normalized: bool = False
+) -> np.ndarray:
+    """Cosine similarity of `query` against every row of `matrix`.
+
+    Both must be float32 with no zero-norm rows. With simsimd installed this
+    is one cdist call; otherwise rows and query are normalized for a matmul
+    (rows are taken as-is when the caller already L2-normalized them).
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    if simsimd is not None:
+        distances = simsimd.cdist(query[None, :], matrix, metric="cosine")
+        return 1.0 - np.asarray(distances, dtype=np.float32).reshape(-1)
+
+    if not rows_normalized:
+        matrix = matrix / np.linalg.norm(matrix, axis=1)[:, None]
+    return matrix @ (query / np.linalg.norm(query))
+
+
+def quantize_int8(vectors: np.ndarray) -> np.ndarray:
+    """Symmetric per-row int8 quantization (scale = max|v| / 127).
+
+    Cosine similarity is scale-invariant, so the scales are not kept.
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scale = np.abs(vectors).max(axis=1, keepdims=True) / 127.0
+    scale[scale == 0] = 1.0
+    return np.ascontiguousarray(np.round(vectors / scale).astype(np.int8))
+
+
+def cosine_similarities_int8(matrix_i8: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Like cosine_similarities, against rows from quantize_int8 (simsimd only)."""
+    distances = simsimd.cdist(quantize_int8(query), matrix_i8, metric="cosine")
+    return 1.0 - np.asarray(distances, dtype=np.float32).reshape(-1)
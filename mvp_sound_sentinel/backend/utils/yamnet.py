@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Dict, Any
+from typing import List, Sequence, Tuple, Dict, Any
 
 import numpy as np
 import tensorflow as tf
 import tensorflow_hub as hub
 
+from backend.utils.yamnet_cached import read_class_names, top_predictions
 
-def load_yamnet_model() -> Tuple[Any, List[str]]:
+
+def load_yamnet_model() -> Tuple[Any, Tuple[str, ...]]:
     """Load YAMNet model and its class names.
 
     Returns:
@@ -44,12 +46,9 @@ def load_yamnet_model() -> Tuple[Any, List[str]]:
             class_map_url,
         )
 
-        class_names: List[str] = []
-        with open(class_names_path, "r") as f:
-            next(f)  # skip header
-            for line in f:
-                # 3rd column contains the display label
-                class_names.append(line.strip().split(",")[2])
+        # csv-based parser shared with the cached loader: quoted labels
+        # with commas inside are read whole.
+        class_names = read_class_names(class_names_path)
 
         print(f"✅ YAMNet модель загружена. Классов: {len(class_names)}")
         return model, class_names
@@ -82,7 +81,7 @@ def extract_embeddings(
 def detect_sound(
     audio_data: List[float],
     model: Any,
-    class_names: List[str],
+    class_names: Sequence[str],
 ) -> Dict[str, Any]:
     """Detect top-5 YAMNet classes for the provided audio chunk."""
     try:
@@ -93,21 +92,11 @@ def detect_sound(
 
         scores, embeddings, _ = model(audio_np)
 
-        top_scores = tf.math.top_k(scores, k=5)
-        results = []
-
-        for i in range(5):
-            class_id = top_scores.indices[0][i].numpy()
-            confidence = top_scores.values[0][i].numpy()
-            class_name = class_names[class_id]
-            results.append(
-                {
-                    "sound_type": class_name,
-                    "confidence": float(confidence),
-                }
-            )
-
-        return {"predictions": results, "embeddings": embeddings.numpy().tolist()}
+        # One host copy of the scores, then top-5 of the first patch via
+        # argpartition (no per-element .numpy() round trips).
+        results = top_predictions(np.asarray(scores), class_names)
+
+        return {"predictions": results, "embeddings": np.asarray(embeddings).tolist()}
     except Exception as e:
         print(f"❌ Ошибка детекции: {e}")
         return {"predictions": [], "embeddings": []}
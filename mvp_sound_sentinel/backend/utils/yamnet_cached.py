@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Dict, Any
+from typing import List, Sequence, Tuple, Dict, Any
+import csv
 import os
 import hashlib
 import requests
@@ -10,6 +11,52 @@ import numpy as np
 import tensorflow as tf
 import tensorflow_hub as hub
 
+from backend.utils.inference_pool import INTER_OP_THREADS, INTRA_OP_THREADS
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    val = os.getenv(name)
+    if val is None:
+        return default
+    return val.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def compile_yamnet(model: Any) -> Any:
+    """Оборачивает модель в tf.function с фиксированной сигнатурой.
+
+    Граф трассируется один раз при загрузке, дальше вызовы идут сразу в
+    скомпилированную конкретную функцию без повторного биндинга Python.
+    XLA (YAMNET_JIT_COMPILE) включается опционально.
+    """
+    jit_compile = _env_bool("YAMNET_JIT_COMPILE", False)
+
+    @tf.function(
+        jit_compile=jit_compile,
+        input_signature=[tf.TensorSpec(shape=[None], dtype=tf.float32)],
+    )
+    def infer(waveform):
+        return model(waveform)
+
+    infer.get_concrete_function()
+    return infer
+
+
+def warm_up(model: Any) -> None:
+    """Прогон на тишине, чтобы первый реальный запрос не платил за аллокации."""
+    model(np.zeros(15300, dtype=np.float32))
+
+
+def read_class_names(class_map_path: Any) -> Tuple[str, ...]:
+    """Читает display_name (3-я колонка) из yamnet_class_map.csv.
+
+    csv.reader корректно разбирает названия в кавычках с запятыми внутри
+    (например "Child speech, kid speaking"), которые split(",") обрезал.
+    """
+    with open(class_map_path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))[1:]  # skip header
+    # Кортеж: словарь классов фиксирован и не должен меняться после загрузки
+    return tuple(row[2] for row in rows if len(row) >= 3)
+
 
 class YAMNetCache:
     """Кэширование YAMNet модели локально"""
@@ -27,6 +74,10 @@ class YAMNetCache:
 
         # Локальные пути
         self.model_path = self.cache_dir / "yamnet_model"
+        self.tflite_int8_path = self.cache_dir / "yamnet_int8.tflite"
+        self.tflite_int8_io_path = self.cache_dir / "yamnet_int8_io.tflite"
+        self.tflite_fp16_path = self.cache_dir / "yamnet_fp16.tflite"
+        self.openvino_path = self.cache_dir / "yamnet_openvino" / "yamnet.xml"
         self.class_map_path = self.cache_dir / "yamnet_class_map.csv"
 
     def is_model_cached(self) -> bool:
@@ -59,7 +110,7 @@ class YAMNetCache:
             print(f"❌ Ошибка скачивания модели: {e}")
             return False
 
-    def load_cached_model(self) -> Tuple[Any, List[str]]:
+    def load_cached_model(self) -> Tuple[Any, Tuple[str, ...]]:
         """Загружает модель из кэша"""
         try:
             print("📂 Загрузка YAMNet из кэша...")
@@ -68,23 +119,76 @@ class YAMNetCache:
             model = tf.saved_model.load(str(self.model_path))
 
             # Загружаем class names
-            class_names = []
-            with open(self.class_map_path, "r", encoding="utf-8") as f:
-                next(f)  # skip header
-                for line in f:
-                    parts = line.strip().split(",")
-                    if len(parts) >= 3:
-                        # 3rd column contains display label
-                        class_names.append(parts[2])
+            class_names = read_class_names(self.class_map_path)
 
             print(f"✅ YAMNet модель загружена из кэша. Классов: {len(class_names)}")
-            return model, class_names
+            runner = None
+            backend = os.getenv("YAMNET_BACKEND", "savedmodel").strip().lower()
+            if backend == "tflite":
+                runner = self.load_tflite_model(model)
+            elif backend == "openvino":
+                runner = self.load_openvino_model(model)
+            if runner is None:
+                runner = compile_yamnet(model)
+
+            warm_up(runner)
+            return runner, class_names
 
         except Exception as e:
             print(f"❌ Ошибка загрузки из кэша: {e}")
             return None, None
 
-    def get_model(self, force_download: bool = False) -> Tuple[Any, List[str]]:
+    def load_tflite_model(self, model: Any) -> Any:
+        """TFLite вариант модели: INT8, а без калибровочных данных FP16.
+
+        None, если собрать не удалось.
+        """
+        from backend.utils.yamnet_tflite import (
+            TFLiteYAMNet,
+            convert_to_fp16,
+            convert_to_int8,
+        )
+
+        try:
+            # Полностью целочисленная модель (int8 вход/выходы) — опционально
+            int8_io = _env_bool("YAMNET_TFLITE_INT8_IO", False)
+            path = self.tflite_int8_io_path if int8_io else self.tflite_int8_path
+            if not path.exists():
+                print("🔧 Квантизация YAMNet в INT8 TFLite...")
+                if not convert_to_int8(
+                    model, path, os.getenv("YAMNET_CALIBRATION_DIR"), int8_io
+                ):
+                    path = self.tflite_fp16_path
+                    if not path.exists():
+                        print("🔧 Квантизация YAMNet в FP16 TFLite...")
+                        convert_to_fp16(model, path)
+
+            print(f"📂 Загрузка YAMNet TFLite: {path}")
+            return TFLiteYAMNet(path, num_threads=INTRA_OP_THREADS)
+        except Exception as e:
+            print(f"❌ Ошибка TFLite, используем SavedModel: {e}")
+            return None
+
+    def load_openvino_model(self, model: Any) -> Any:
+        """OpenVINO вариант модели; None, если openvino недоступен или упал."""
+        try:
+            from backend.utils.yamnet_openvino import (
+                OpenVINOYAMNet,
+                convert_to_openvino,
+            )
+
+            if not self.openvino_path.exists():
+                print("🔧 Конвертация YAMNet в OpenVINO IR...")
+                self.openvino_path.parent.mkdir(parents=True, exist_ok=True)
+                convert_to_openvino(model, self.openvino_path)
+
+            print(f"📂 Загрузка YAMNet OpenVINO: {self.openvino_path}")
+            return OpenVINOYAMNet(self.openvino_path)
+        except Exception as e:
+            print(f"❌ Ошибка OpenVINO, используем SavedModel: {e}")
+            return None
+
+    def get_model(self, force_download: bool = False) -> Tuple[Any, Tuple[str, ...]]:
         """Получает модель (из кэша или скачивает)"""
         if force_download or not self.is_model_cached():
             if not self.download_model():
@@ -97,7 +201,33 @@ class YAMNetCache:
 _yamnet_cache = YAMNetCache()
 
 
-def load_yamnet_model(force_download: bool = False) -> Tuple[Any, List[str]]:
+def configure_tf_threading() -> None:
+    """Делит ядра между воркерами пула инференса (до первой операции TF)."""
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(INTRA_OP_THREADS)
+        tf.config.threading.set_inter_op_parallelism_threads(INTER_OP_THREADS)
+    except RuntimeError as e:
+        # TF уже инициализирован (повторная загрузка) — оставляем как есть
+        print(f"⚠️ Не удалось настроить потоки TF: {e}")
+
+
+def configure_gpus() -> None:
+    """memory growth для всех GPU: TF не забирает всю видеопамять сразу.
+
+    Если GPU есть, TF сам размещает на нём свёртки YAMNet (SavedModel путь).
+    """
+    try:
+        gpus = tf.config.list_physical_devices("GPU")
+        for gpu in gpus:
+            tf.config.experimental.set_memory_growth(gpu, True)
+        if gpus:
+            print(f"🎮 YAMNet на GPU: {', '.join(gpu.name for gpu in gpus)}")
+    except RuntimeError as e:
+        # GPU уже инициализирован — оставляем как есть
+        print(f"⚠️ Не удалось настроить GPU: {e}")
+
+
+def load_yamnet_model(force_download: bool = False) -> Tuple[Any, Tuple[str, ...]]:
     """Загрузка YAMNet модели с локальным кэшированием
 
     Args:
@@ -106,22 +236,53 @@ def load_yamnet_model(force_download: bool = False) -> Tuple[Any, List[str]]:
     Returns:
         (model, class_names)
     """
+    configure_tf_threading()
+    configure_gpus()
     return _yamnet_cache.get_model(force_download=force_download)
 
 
-def extract_embeddings(audio_data: List[float], model: Any) -> List[float]:
-    """Извлечение средних YAMNet эмбеддингов для аудио"""
-    try:
-        audio_np = np.array(audio_data, dtype=np.float32)
+def run_yamnet(audio_data: Any, model: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Один прогон YAMNet: (scores по патчам, средний эмбеддинг 1024-d).
+
+    Скоры и эмбеддинги берутся из одного вызова модели, чтобы детекция и
+    поиск custom-звуков не гоняли одно и то же аудио дважды.
+    """
+    # float32 ndarray проходит без копии
+    audio_np = np.asarray(audio_data, dtype=np.float32)
+
+    # YAMNet ожидает моно 16kHz. Если многоканальный, берём первый канал
+    if len(audio_np.shape) > 1:
+        audio_np = audio_np[:, 0]
 
-        # YAMNet ожидает моно 16kHz. Если многоканальный, берём первый канал
-        if len(audio_np.shape) > 1:
-            audio_np = audio_np[:, 0]
+    scores, embeddings, _ = model(audio_np)
+    return np.asarray(scores), np.mean(np.asarray(embeddings), axis=0)
 
-        _, embeddings, _ = model(audio_np)
 
-        # Возвращаем средний эмбеддинг по времени (1024-d вектор)
-        embedding_mean = np.mean(embeddings.numpy(), axis=0)
+def top_predictions(
+    scores: np.ndarray, class_names: Sequence[str], k: int = 5
+) -> List[Dict[str, Any]]:
+    """Топ-k классов по скорам первого патча (как tf.math.top_k(scores)[0]).
+
+    argpartition выбирает k лучших за O(n), сортируются только они.
+    """
+    first_patch = np.asarray(scores)
+    if first_patch.ndim > 1:
+        first_patch = first_patch[0]
+    top = np.argpartition(first_patch, -k)[-k:]
+    top = top[np.argsort(-first_patch[top])]
+    return [
+        {
+            "sound_type": class_names[class_id],
+            "confidence": float(first_patch[class_id]),
+        }
+        for class_id in top
+    ]
+
+
+def extract_embeddings(audio_data: List[float], model: Any) -> List[float]:
+    """Извлечение средних YAMNet эмбеддингов для аудио"""
+    try:
+        _, embedding_mean = run_yamnet(audio_data, model)
         return embedding_mean.tolist()
     except Exception as e:
         print(f"❌ Ошибка извлечения embeddings: {e}")
@@ -131,35 +292,17 @@ def extract_embeddings(audio_data: List[float], model: Any) -> List[float]:
 def detect_sound(
     audio_data: List[float],
     model: Any,
-    class_names: List[str],
+    class_names: Sequence[str],
 ) -> Dict[str, Any]:
     """Детекция топ-5 YAMNet классов для аудио"""
     try:
-        audio_np = np.array(audio_data, dtype=np.float32)
-
-        if len(audio_np.shape) > 1:
-            audio_np = audio_np[:, 0]
-
-        scores, embeddings, _ = model(audio_np)
-
-        top_scores = tf.math.top_k(scores, k=5)
-        results = []
-
-        for i in range(5):
-            class_id = top_scores.indices[0][i].numpy()
-            confidence = top_scores.values[0][i].numpy()
-            class_name = class_names[class_id]
-            results.append(
-                {
-                    "sound_type": class_name,
-                    "confidence": float(confidence),
-                }
-            )
-
-        return {"predictions": results, "embeddings": embeddings.numpy().tolist()}
+        scores, _ = run_yamnet(audio_data, model)
+        # Эмбеддинги патчей не возвращаем: (N, 1024).tolist() дороже самой
+        # детекции, а вызывающим нужен только топ-5
+        return {"predictions": top_predictions(scores, class_names)}
     except Exception as e:
         print(f"❌ Ошибка детекции: {e}")
-        return {"predictions": [], "embeddings": []}
+        return {"predictions": []}
 
 
 def clear_yamnet_cache() -> bool:
@@ -185,6 +328,14 @@ def get_cache_info() -> Dict[str, Any]:
         "cache_dir": str(_yamnet_cache.cache_dir),
         "model_cached": _yamnet_cache.is_model_cached(),
         "model_path": str(_yamnet_cache.model_path),
+        "tflite_int8_path": str(_yamnet_cache.tflite_int8_path),
+        "tflite_int8_cached": _yamnet_cache.tflite_int8_path.exists(),
+        "tflite_int8_io_path": str(_yamnet_cache.tflite_int8_io_path),
+        "tflite_int8_io_cached": _yamnet_cache.tflite_int8_io_path.exists(),
+        "tflite_fp16_path": str(_yamnet_cache.tflite_fp16_path),
+        "tflite_fp16_cached": _yamnet_cache.tflite_fp16_path.exists(),
+        "openvino_path": str(_yamnet_cache.openvino_path),
+        "openvino_cached": _yamnet_cache.openvino_path.exists(),
         "class_map_path": str(_yamnet_cache.class_map_path),
         "model_url": _yamnet_cache.model_url,
         "class_map_url": _yamnet_cache.class_map_url,
@@ -0,0 +1,72 @@
+"""
+YAMNet через OpenVINO (Intel CPU).
+
+Включается переменной окружения YAMNET_BACKEND=openvino. IR-модель
+(yamnet.xml/.bin) конвертируется один раз из SavedModel и кэшируется рядом с
+ним. Пакет openvino опционален и импортируется только здесь.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+
+_NUM_SCORES = 521
+_EMBEDDING_SIZE = 1024
+
+
+def convert_to_openvino(model: Any, output_path: Path) -> None:
+    """Конвертирует YAMNet в OpenVINO IR и сохраняет в output_path (.xml)."""
+    import openvino as ov
+
+    @tf.function(input_signature=[tf.TensorSpec(shape=[None], dtype=tf.float32)])
+    def infer(waveform):
+        return model(waveform)
+
+    ov_model = ov.convert_model(infer.get_concrete_function())
+    ov.save_model(ov_model, str(output_path))
+    print(f"✅ YAMNet OpenVINO IR сохранён: {output_path}")
+
+
+class OpenVINOYAMNet:
+    """Вызов как у SavedModel: model(waveform) -> (scores, embeddings, spectrogram).
+
+    Один infer request на модель, сериализованный локом (вызовы идут из
+    asyncio.to_thread воркеров).
+    """
+
+    def __init__(self, model_path: Path, config: Optional[Dict[str, str]] = None):
+        import openvino as ov
+
+        core = ov.Core()
+        self._compiled = core.compile_model(
+            core.read_model(str(model_path)),
+            "CPU",
+            config or {"PERFORMANCE_HINT": "LATENCY"},
+        )
+        self._request = self._compiled.create_infer_request()
+        self._lock = threading.Lock()
+        self._outputs = self._order_outputs()
+
+    def _order_outputs(self) -> List[Any]:
+        # Различаем выходы по последней размерности
+        by_width = {
+            output.get_partial_shape()[-1].get_length(): output
+            for output in self._compiled.outputs
+        }
+        scores = by_width.pop(_NUM_SCORES)
+        embeddings = by_width.pop(_EMBEDDING_SIZE)
+        (spectrogram,) = by_width.values()
+        return [scores, embeddings, spectrogram]
+
+    def __call__(self, waveform: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+        with self._lock:
+            results = self._request.infer([waveform])
+            # Копируем: буферы infer request переиспользуются следующим вызовом
+            return tuple(np.array(results[output]) for output in self._outputs)
@@ -0,0 +1,218 @@
+"""
+YAMNet через TFLite: post-training квантизация (INT8 или FP16) и обёртка
+интерпретатора.
+
+Включается переменной окружения YAMNET_BACKEND=tflite. Квантованная модель
+собирается один раз из закэшированного SavedModel и сохраняется рядом с ним.
+Собрать её заранее, без запуска сервера:
+
+    python -m backend.utils.yamnet_tflite --fp16
+    python -m backend.utils.yamnet_tflite --int8 --calibration-dir wavs/
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from backend.utils.audio import WINDOW_SAMPLES
+
+
+CALIBRATION_WINDOWS = 200
+
+_NUM_SCORES = 521
+_EMBEDDING_SIZE = 1024
+
+
+def _calibration_windows(calibration_dir: Path) -> Iterator[np.ndarray]:
+    """Нарезает 16 kHz wav из каталога на окна для калибровки."""
+    produced = 0
+    for wav_path in sorted(calibration_dir.glob("*.wav")):
+        audio, sample_rate = tf.audio.decode_wav(tf.io.read_file(str(wav_path)))
+        if int(sample_rate) != 16000:
+            print(f"⚠️ Пропуск {wav_path.name}: {int(sample_rate)} Hz (нужно 16000)")
+            continue
+        waveform = audio.numpy()[:, 0]
+        for start in range(0, waveform.size - WINDOW_SAMPLES + 1, WINDOW_SAMPLES):
+            yield waveform[start : start + WINDOW_SAMPLES]
+            produced += 1
+            if produced >= CALIBRATION_WINDOWS:
+                return
+
+
+def _make_converter(model: Any) -> tf.lite.TFLiteConverter:
+    @tf.function(input_signature=[tf.TensorSpec(shape=[None], dtype=tf.float32)])
+    def infer(waveform):
+        return model(waveform)
+
+    return tf.lite.TFLiteConverter.from_concrete_functions(
+        [infer.get_concrete_function()], model
+    )
+
+
+def convert_to_int8(
+    model: Any,
+    output_path: Path,
+    calibration_dir: Optional[str],
+    int8_io: bool = False,
+) -> bool:
+    """INT8 PTQ модели YAMNet; результат пишется в output_path.
+
+    Веса и активации MobileNet квантуются в int8 по калибровочным окнам.
+    Вход/выход по умолчанию остаются float32; с int8_io модель полностью
+    целочисленная, а (де)квантизацию делает TFLiteYAMNet. Операции
+    спектрограммы, у которых нет int8-ядер, остаются во float (TFLITE_BUILTINS).
+    """
+    if not calibration_dir or not Path(calibration_dir).is_dir():
+        print("⚠️ YAMNET_CALIBRATION_DIR не задан или не найден, INT8 недоступен")
+        return False
+
+    windows = list(_calibration_windows(Path(calibration_dir)))
+    if not windows:
+        print(f"⚠️ В {calibration_dir} нет 16 kHz wav для калибровки")
+        return False
+
+    def representative_dataset():
+        for window in windows:
+            yield [window]
+
+    converter = _make_converter(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [
+        tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+        tf.lite.OpsSet.TFLITE_BUILTINS,
+    ]
+    io_type = tf.int8 if int8_io else tf.float32
+    converter.inference_input_type = io_type
+    converter.inference_output_type = io_type
+
+    output_path.write_bytes(converter.convert())
+    print(f"✅ YAMNet INT8 сохранён: {output_path} ({len(windows)} окон калибровки)")
+    return True
+
+
+def convert_to_fp16(model: Any, output_path: Path) -> bool:
+    """FP16 квантизация весов; не требует калибровочных данных."""
+    converter = _make_converter(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+
+    output_path.write_bytes(converter.convert())
+    print(f"✅ YAMNet FP16 сохранён: {output_path}")
+    return True
+
+
+def _quant_params(details: Dict[str, Any]) -> Optional[Tuple[float, int]]:
+    """(scale, zero_point) для int8 тензора, None для float."""
+    if details["dtype"] != np.int8:
+        return None
+    scale, zero_point = details["quantization"]
+    return float(scale), int(zero_point)
+
+
+class TFLiteYAMNet:
+    """Вызов как у SavedModel: model(waveform) -> (scores, embeddings, spectrogram).
+
+    Интерпретатор не потокобезопасен, а модель вызывается из пула потоков,
+    поэтому invoke сериализуется локом. int8 вход/выходы (де)квантуются по
+    (scale, zero_point) тензоров, так что вызывающий код всегда видит float32.
+    """
+
+    def __init__(self, model_path: Path, num_threads: Optional[int] = None):
+        self._interpreter = tf.lite.Interpreter(
+            model_path=str(model_path),
+            num_threads=num_threads or os.cpu_count(),
+        )
+        self._lock = threading.Lock()
+        input_details = self._interpreter.get_input_details()[0]
+        self._input_index = input_details["index"]
+        self._input_quant = _quant_params(input_details)
+        self._input_length = -1
+        self._resize(WINDOW_SAMPLES)
+        self._outputs = self._order_outputs()
+
+    def _resize(self, length: int) -> None:
+        if length != self._input_length:
+            self._interpreter.resize_tensor_input(self._input_index, [length])
+            self._interpreter.allocate_tensors()
+            self._input_length = length
+
+    def _order_outputs(self) -> List[Tuple[int, Optional[Tuple[float, int]]]]:
+        # Порядок выходов у конвертера не гарантирован: различаем по размерности
+        by_width = {
+            int(d["shape"][-1]): (d["index"], _quant_params(d))
+            for d in self._interpreter.get_output_details()
+        }
+        scores = by_width.pop(_NUM_SCORES)
+        embeddings = by_width.pop(_EMBEDDING_SIZE)
+        (spectrogram,) = by_width.values()
+        return [scores, embeddings, spectrogram]
+
+    def __call__(self, waveform: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+        if self._input_quant is not None:
+            scale, zero_point = self._input_quant
+            waveform = np.clip(
+                np.rint(waveform / scale) + zero_point, -128, 127
+            ).astype(np.int8)
+        with self._lock:
+            self._resize(waveform.shape[0])
+            self._interpreter.set_tensor(self._input_index, waveform)
+            self._interpreter.invoke()
+            outputs = [
+                (self._interpreter.get_tensor(index), quant)
+                for index, quant in self._outputs
+            ]
+        return tuple(
+            values
+            if quant is None
+            else (values.astype(np.float32) - quant[1]) * np.float32(quant[0])
+            for values, quant in outputs
+        )
+
+
+def main() -> None:
+    """Офлайн-конвертация SavedModel из кэша в TFLite по путям сервера."""
+    from backend.utils.yamnet_cached import YAMNetCache
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--fp16", action="store_true")
+    mode.add_argument("--int8", action="store_true")
+    parser.add_argument("--int8-io", action="store_true")
+    parser.add_argument(
+        "--calibration-dir", default=os.getenv("YAMNET_CALIBRATION_DIR")
+    )
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    cache = YAMNetCache()
+    if not cache.is_model_cached() and not cache.download_model():
+        raise SystemExit("Не удалось скачать YAMNet модель")
+
+    if args.fp16:
+        path = cache.tflite_fp16_path
+    elif args.int8_io:
+        path = cache.tflite_int8_io_path
+    else:
+        path = cache.tflite_int8_path
+    if path.exists() and not args.force:
+        print(f"✅ Уже собрано: {path} (--force для пересборки)")
+        return
+
+    model = tf.saved_model.load(str(cache.model_path))
+    if args.fp16:
+        convert_to_fp16(model, path)
+    elif not convert_to_int8(model, path, args.calibration_dir, args.int8_io):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,7 @@ export default function App() {
     // WebSocket для реального времени
     const ws = apiClient.connectWebSocket((data) => {
       // Skip logging for audio_level_updated, device_updated, and keepalive to reduce console noise
-      if (data && data.type !== "audio_level_updated" && data.type !== "device_updated" && data.type !== "keepalive") {
+      if (data && data.type !== "audio_level_updated" && data.type !== "device_updated" && data.type !== "devices_updated" && data.type !== "keepalive") {
         console.log("WebSocket received:", data);
       }
 
@@ -59,6 +59,18 @@ export default function App() {
               : device
           )
         );
+      } else if (data && data.type === "devices_updated") {
+        // Пакетное обновление (PUT /update_devices): одно сообщение на всю пачку
+        const updates = new Map<string, any>(
+          (data.devices || []).map((item: any) => [item.device_id, item.device_info])
+        );
+        setDevices((prev) =>
+          prev.map((device) =>
+            updates.has(device.id)
+              ? { ...device, ...updates.get(device.id) }
+              : device
+          )
+        );
       } else if (data && data.type === "sound_detected") {
         // Проверяем на дубликаты событий (с учетом времени)
         const eventKey = `${data.device_id}-${data.sound_type}-${data.timestamp}`;
@@ -89,7 +89,9 @@ class ApiClient {
     name: string;
     sound_type: "specific" | "excluded";
     device_id: string;
-    audio_recordings: number[][];
+    audio_recordings?: number[][];
+    audio_recordings_b64?: string[];
+    audio_dtype?: "int16" | "float32";
     threshold?: number;
   }): Promise<any> {
     return this.request("/custom_sounds/train", {
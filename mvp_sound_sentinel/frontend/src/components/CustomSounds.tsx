@@ -3,6 +3,16 @@ import { ArrowLeft, VolumeX, Zap, Plus, Trash2, X } from 'lucide-react';
 import { AudioRecorder } from './AudioRecorder';
 import { apiClient } from '../api/client';
 
+// Сырые байты Float32Array в base64 (порядок байт платформы, на практике little-endian)
+function float32ToBase64(samples: Float32Array): string {
+  const bytes = new Uint8Array(samples.buffer, samples.byteOffset, samples.byteLength);
+  let binary = '';
+  for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000));
+  }
+  return btoa(binary);
+}
+
 interface Props {
   sounds: any[];
   onBack: () => void;
@@ -95,7 +105,9 @@ export function CustomSounds({ sounds, onBack, onRefresh, selectedDeviceId }: Pr
         name: soundName,
         sound_type: soundType,
         device_id: selectedDeviceId,
-        audio_recordings: recordings.map(r => Array.from(r)), // Конвертируем Float32Array в массив
+        // Float32Array как base64 little-endian PCM: без JSON-массива из тысяч чисел
+        audio_recordings_b64: recordings.map(float32ToBase64),
+        audio_dtype: 'float32',
       });
       
       // Сброс формы
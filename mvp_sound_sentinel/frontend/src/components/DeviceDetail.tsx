@@ -82,6 +82,15 @@ export function DeviceDetail({ deviceId, onBack }: Props) {
             prev ? { ...prev, ...data.device_info } : null,
           );
         }
+      } else if (data.type === "devices_updated") {
+        const update = (data.devices || []).find(
+          (item: any) => item.device_id === deviceId,
+        );
+        if (update) {
+          setDevice((prev: any) =>
+            prev ? { ...prev, ...update.device_info } : null,
+          );
+        }
       }
     });
 
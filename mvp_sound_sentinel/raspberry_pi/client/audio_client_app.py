@@ -268,6 +268,16 @@ class AudioClient:
         """Расчет уровня звука в дБ (RMS)"""
         return _audio_math.calculate_db(audio_data)
 
+    def _post_raw_audio(self, body, params, timeout):
+        """POST сырого PCM на /detect_sound_raw"""
+        return self.session.post(
+            f"{API_SERVER_URL}/detect_sound_raw",
+            params=params,
+            data=body,
+            headers={"Content-Type": "application/octet-stream"},
+            timeout=timeout,
+        )
+
     def send_audio_chunk(self, audio_data):
         """Отправка аудио чанка на детекцию"""
         try:
@@ -280,18 +290,18 @@ class AudioClient:
             db_level = self.calculate_db(processed_audio)
             normalized_db = db_level + 100
 
-            payload = {
+            # Сырой int16 PCM в теле запроса: без JSON и base64 (+33%),
+            # сервер декодирует его одним np.frombuffer.
+            pcm = (np.clip(processed_audio, -1.0, 1.0) * 32767).astype("<i2")
+            body = pcm.tobytes()
+            params = {
                 "device_id": self.device_id,
-                "audio_data": processed_audio.tolist(),
                 "sample_rate": SAMPLE_RATE,
+                "dtype": "int16",
                 "db_level": normalized_db,
             }
 
-            response = self.session.post(
-                f"{API_SERVER_URL}/detect_sound",
-                json=payload,
-                timeout=30,
-            )
+            response = self._post_raw_audio(body, params, timeout=30)
 
             if response.status_code == 200:
                 result = response.json()
@@ -307,11 +317,7 @@ class AudioClient:
         except requests.exceptions.Timeout:
             print(f"Таймаут отправки аудио, пробую еще раз...")
             try:
-                response = self.session.post(
-                    f"{API_SERVER_URL}/detect_sound",
-                    json=payload,
-                    timeout=15,
-                )
+                response = self._post_raw_audio(body, params, timeout=15)
                 if response.status_code == 200:
                     result = response.json()
                     sound_type = result["sound_type"]
@@ -419,7 +425,11 @@ class AudioClient:
             f"Начинаю мониторинг (дБ каждые {LEVEL_UPDATE_INTERVAL}s, детекция каждые {DETECTION_INTERVAL}s)..."
         )
 
-        audio_buffer = []
+        # Один непрерывный float32 буфер на весь интервал детекции:
+        # чанки пишутся в срезы, без списка и np.concatenate.
+        chunks_per_detection = int(np.ceil(DETECTION_INTERVAL / LEVEL_UPDATE_INTERVAL))
+        audio_buffer = np.empty(chunks_per_detection * CHUNK_SIZE, dtype=np.float32)
+        buffered = 0
         seconds_passed = 0
         last_device_info_update = 0.0
         last_wifi_update = 0.0
@@ -453,13 +463,18 @@ class AudioClient:
                 self.send_audio_level(normalized_db)
 
                 # Buffer for detections
-                audio_buffer.append(audio_data)
+                chunk_len = len(audio_data)
+                if buffered + chunk_len > audio_buffer.size:
+                    grown = np.empty(buffered + chunk_len, dtype=np.float32)
+                    grown[:buffered] = audio_buffer[:buffered]
+                    audio_buffer = grown
+                audio_buffer[buffered : buffered + chunk_len] = audio_data
+                buffered += chunk_len
                 seconds_passed += LEVEL_UPDATE_INTERVAL
 
                 if seconds_passed >= DETECTION_INTERVAL:
-                    full_audio_to_detect = np.concatenate(audio_buffer)
-                    self.send_audio_chunk(full_audio_to_detect)
-                    audio_buffer = []
+                    self.send_audio_chunk(audio_buffer[:buffered])
+                    buffered = 0
                     seconds_passed = 0
 
                 now = time.monotonic()
@@ -26,9 +26,14 @@ def resample_audio(audio_data: Any, original_rate: int, target_rate: int):
 def calculate_db(audio_data) -> float:
     """Calculate sound level in dB (RMS)."""
     try:
-        rms = np.sqrt(np.mean(np.square(audio_data)))
-        if rms > 0:
-            db = 20 * np.log10(rms)
+        audio = np.asarray(audio_data).ravel()
+        if audio.size == 0:
+            return -100.0
+        # Mean square via one dot product (no squared temp array);
+        # 20*log10(sqrt(ms)) == 10*log10(ms).
+        mean_square = float(np.dot(audio, audio)) / audio.size
+        if mean_square > 0:
+            db = 10 * np.log10(mean_square)
             return float(max(-100, min(0, db)))
         return -100.0
     except Exception as e:
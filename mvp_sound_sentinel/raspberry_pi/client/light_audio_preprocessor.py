@@ -10,6 +10,13 @@ Light Audio Preprocessor
 import numpy as np
 
 
+def _peak(audio: np.ndarray) -> float:
+    """Пиковая амплитуда через max/min, без временного массива np.abs"""
+    if audio.size == 0:
+        return 0.0
+    return float(max(audio.max(), -audio.min()))
+
+
 class LightAudioPreprocessor:
     """Супер-лёгкий предпроцессор (только DC-removal + peak_normalize)"""
     
@@ -36,7 +43,7 @@ class LightAudioPreprocessor:
         audio = audio - np.mean(audio)
         
         # Peak normalization для стабильной амплитуды
-        peak = np.max(np.abs(audio))
+        peak = _peak(audio)
         if peak > 0:
             return audio * (self.target_peak / peak)
         else:
@@ -59,7 +66,7 @@ def light_preprocess(audio: np.ndarray, target_peak: float = 0.95) -> np.ndarray
     audio = audio - np.mean(audio)
     
     # Peak normalization
-    peak = np.max(np.abs(audio))
+    peak = _peak(audio)
     if peak > 0:
         return audio * (target_peak / peak)
     else: